@@ -0,0 +1,78 @@
+import pytest
+
+from wake.testing import *
+from wake_tests.erc20 import (
+    ERC20Abi,
+    ERC20Minimal,
+    ERC20Recommended,
+    ERC20Desirable,
+    ERC20Fingerprint,
+)
+from wake_tests.erc20.benchmark import benchmark_fuzz
+
+from pytypes.contracts.BoringERC20 import BoringERC20
+from pytypes.contracts.OZERC20 import OZERC20
+from pytypes.contracts.PureERC20 import ERC20 as PureERC20
+from pytypes.contracts.SoladyERC20 import SoladyERC20
+from pytypes.contracts.SolmateERC20 import SolmateERC20
+
+
+# run with `wake test benchmarks`, compare the reports of two commits with
+# `wake_tests.erc20.benchmark.compare_reports`
+REPORT = "benchmark.json"
+SEED = 42
+SEQUENCES = 10
+FLOWS = 50
+
+TOKENS = [BoringERC20, OZERC20, PureERC20, SoladyERC20, SolmateERC20]
+
+
+class Base(ERC20Abi, ERC20Minimal, ERC20Recommended, ERC20Desirable, ERC20Fingerprint):
+    token_class = None
+
+    chain_scope = "class"
+    instrumentation_report = REPORT
+
+    @classmethod
+    def deploy_token(cls) -> Account:
+        owner = default_chain.accounts[0]
+        default_chain.set_default_accounts(owner)
+        return cls.token_class.deploy(cls.initial_supply)
+
+
+class TestBoringERC20(Base):
+    token_class = BoringERC20
+
+
+class TestOZERC20(Base):
+    token_class = OZERC20
+
+
+class TestPureERC20(Base):
+    token_class = PureERC20
+
+
+class TestSoladyERC20(Base):
+    token_class = SoladyERC20
+
+
+class TestSolmateERC20(Base):
+    token_class = SolmateERC20
+
+
+@pytest.mark.parametrize("token_class", TOKENS, ids=lambda t: t.__name__)
+def test_fuzz(token_class):
+    def deploy() -> Account:
+        owner = default_chain.accounts[0]
+        default_chain.set_default_accounts(owner)
+        return token_class.deploy(0)
+
+    benchmark_fuzz(
+        f"Test{token_class.__name__}",
+        deploy,
+        SEQUENCES,
+        FLOWS,
+        REPORT,
+        seed=SEED,
+        chain_kwargs=dict(accounts=20),
+    )
@@ -0,0 +1,32 @@
+import pytest
+
+from wake_tests.erc20.abi import check_abi_conformance
+
+from pytypes.contracts.BoringERC20 import BoringERC20
+from pytypes.contracts.OZERC20 import OZERC20
+from pytypes.contracts.PureERC20 import ERC20 as PureERC20
+from pytypes.contracts.SoladyERC20 import SoladyERC20
+from pytypes.contracts.SolmateERC20 import SolmateERC20
+
+
+# no chain is needed, the pytypes classes are inspected directly
+@pytest.mark.parametrize(
+    "token_class",
+    [BoringERC20, OZERC20, PureERC20, SoladyERC20, SolmateERC20],
+    ids=lambda token_class: token_class.__name__,
+)
+def test_abi_conformance(token_class):
+    problems = check_abi_conformance(token_class, optional=False)
+    assert not problems, "\n".join(problems)
+
+
+def test_abi_conformance_problems():
+    class Empty:
+        _abi = {}
+
+    problems = check_abi_conformance(Empty)
+    missing = "The transfer(address,uint256) selector is not present in the ABI."
+    assert missing in problems
+    assert "The Transfer event is not present in the contract." in problems
+    # 6 required and 3 optional functions, 2 events
+    assert len(problems) == 11
@@ -0,0 +1,139 @@
+import os
+
+import pytest
+
+from wake.testing import *
+from wake_tests.erc20 import ERC20FuzzTest
+from wake_tests.erc20.corpus import (
+    encode_address,
+    load_corpus,
+    load_sequence,
+    save_sequence,
+)
+from wake_tests.erc20.shrink import shrink_sequence
+
+from pytypes.contracts.OZERC20 import OZERC20
+
+
+STEPS = [
+    {"operation": "approve", "owner": 3, "spender": 5, "amount": 700},
+    {"operation": "transfer", "owner": 4, "receiver": "0x" + "12" * 20, "amount": 9},
+    {"operation": "transfer", "owner": 3, "receiver": 7, "amount": 5000},
+    {
+        "operation": "transferFrom",
+        "owner": 3,
+        "spender": 5,
+        "receiver": 6,
+        "amount": 2**255,
+    },
+]
+
+
+def test_encode_address():
+    account = Address("0x" + "ab" * 20)
+    other = Address("0x" + "cd" * 20)
+    assert encode_address(account, {account: 2}) == 2
+    assert encode_address(other, {account: 2}) == str(other)
+
+
+def test_corpus_round_trip(tmp_path):
+    directory = str(tmp_path)
+    sequence = save_sequence(directory, STEPS)
+    failure = save_sequence(directory, STEPS[:2], "Traceback ...")
+    # the file name is derived from the steps
+    assert save_sequence(directory, STEPS) == sequence
+    assert len(os.listdir(directory)) == 2
+
+    entry = load_sequence(sequence)
+    assert entry.steps == STEPS
+    assert entry.failure is None
+    assert entry.diagnostics == []
+
+    kinds = [("ZeroAddressWarning", "transfer", "succeeded")]
+    entry = load_sequence(save_sequence(directory, STEPS[:1], diagnostics=kinds))
+    assert entry.diagnostics == kinds
+    os.remove(entry.path)
+
+    # failures are replayed first
+    entries = load_corpus(directory)
+    assert [entry.path for entry in entries] == [failure, sequence]
+    assert entries[0].failure == "Traceback ..."
+    assert load_corpus(os.path.join(directory, "missing")) == []
+
+
+def _fails(steps) -> bool:
+    # a transfer of at least 1000 by an owner who approved someone before
+    approved = set()
+    for step in steps:
+        if step["operation"] == "approve":
+            approved.add(step["owner"])
+        elif step["operation"] == "transfer" and step["amount"] >= 1000:
+            if step["owner"] in approved:
+                return True
+    return False
+
+
+def test_shrink_sequence():
+    shrunk = shrink_sequence(STEPS, _fails, account_count=10)
+    assert shrunk == [
+        {"operation": "approve", "owner": 0, "spender": 0, "amount": 0},
+        {"operation": "transfer", "owner": 0, "receiver": 0, "amount": 1000},
+    ]
+
+
+def test_shrink_sequence_attempts():
+    calls = []
+
+    def fails(steps) -> bool:
+        calls.append(steps)
+        return _fails(steps)
+
+    shrunk = shrink_sequence(STEPS, fails, account_count=10, max_attempts=3)
+    assert len(calls) == 3
+    assert _fails(shrunk)
+
+
+class _FailingFuzzTest(ERC20FuzzTest):
+    """Fails on every transfer of at least 1000 tokens, even if it is correct."""
+
+    def _execute(self, step) -> None:
+        super()._execute(step)
+        assert not (
+            step["operation"] == "transfer" and step["amount"] >= 1000
+        ), "Injected failure"
+
+
+def _deploy_erc20() -> Account:
+    owner = default_chain.accounts[0]
+    default_chain.set_default_accounts(owner)
+    return OZERC20.deploy(0)
+
+
+@default_chain.connect(accounts=20)
+def test_replay_and_shrink(tmp_path):
+    test = _FailingFuzzTest(_deploy_erc20(), corpus_dir=str(tmp_path))
+    test.replay(STEPS[:2])
+    with pytest.raises(AssertionError, match="Injected failure"):
+        test.replay(STEPS)
+
+    shrunk = test.shrink(STEPS)
+    assert shrunk == [
+        {"operation": "transfer", "owner": 0, "receiver": 0, "amount": 1000}
+    ]
+    (entry,) = load_corpus(str(tmp_path))
+    assert entry.steps == shrunk
+    assert "Injected failure" in entry.failure
+
+
+@default_chain.connect(accounts=20)
+def test_shrink_failures(tmp_path):
+    test = _FailingFuzzTest(
+        _deploy_erc20(), corpus_dir=str(tmp_path), shrink_failures=True
+    )
+    with pytest.raises(AssertionError, match="Injected failure"):
+        test.run(10, 50)
+
+    # the failing sequence and its shrunk version
+    failures = [entry for entry in load_corpus(str(tmp_path)) if entry.failure]
+    assert len(failures) == 2
+    assert min(len(entry.steps) for entry in failures) == 1
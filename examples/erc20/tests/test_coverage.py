@@ -0,0 +1,30 @@
+from wake.testing import *
+from wake_tests.erc20 import ERC20FuzzTest
+from wake_tests.erc20.corpus import load_corpus
+
+from pytypes.contracts.OZERC20 import OZERC20
+
+
+@default_chain.connect(accounts=20)
+def test_coverage_guided_fuzz(tmp_path):
+    owner = default_chain.accounts[0]
+    default_chain.set_default_accounts(owner)
+    token = OZERC20.deploy(0)
+
+    test = ERC20FuzzTest(token, coverage_guided=True, corpus_dir=str(tmp_path))
+    test.run(3, 30)
+    assert test.coverage.edges
+    assert test.coverage.transactions > 0
+    assert test.coverage.history[-1][2] == len(test.coverage.edges)
+    assert test.interesting
+
+    # the first sequence reached new edges, so it was saved
+    entries = load_corpus(str(tmp_path))
+    assert entries and all(entry.failure is None for entry in entries)
+
+    # replaying the corpus covers its edges, the same run saves nothing new
+    count = len(entries)
+    test = ERC20FuzzTest(token, coverage_guided=True, corpus_dir=str(tmp_path))
+    test.run(0, 30)
+    assert test.coverage.edges
+    assert len(load_corpus(str(tmp_path))) == count
@@ -9,37 +9,38 @@ from pytypes.contracts.SolmateERC20 import SolmateERC20
 
 
 class Base(ERC20Abi, ERC20Minimal, ERC20Recommended, ERC20Desirable, ERC20Fingerprint):
-    _token_class = None
+    token_class = None
 
     decimals = 18
     initial_supply = 0
     initial_balances = {}
     mint_amount = 0
     static_max_allowance = True
+    chain_scope = "class"
 
     @classmethod
     def deploy_token(cls) -> Account:
         owner = default_chain.accounts[0]
         default_chain.set_default_accounts(owner)
-        token = cls._token_class.deploy(cls.initial_supply)
+        token = cls.token_class.deploy(cls.initial_supply)
         return token
 
 
 class TestBoringERC20(Base):
-    _token_class = BoringERC20
+    token_class = BoringERC20
 
 
 class TestOZERC20(Base):
-    _token_class = OZERC20
+    token_class = OZERC20
 
 
 class TestPureERC20(Base):
-    _token_class = PureERC20
+    token_class = PureERC20
 
 
 class TestSoladyERC20(Base):
-    _token_class = SoladyERC20
+    token_class = SoladyERC20
 
 
 class TestSolmateERC20(Base):
-    _token_class = SolmateERC20
+    token_class = SolmateERC20
@@ -1,5 +1,7 @@
+import pytest
+
 from wake.testing import *
-from wake_tests.erc20 import ERC20FuzzTest
+from wake_tests.erc20 import ERC20FuzzTest, ERC20MultiFuzzTest, run_fuzz_parallel
 
 from pytypes.contracts.BoringERC20 import BoringERC20
 from pytypes.contracts.OZERC20 import OZERC20
@@ -39,6 +41,12 @@ def test_oz_fuzz():
     ERC20FuzzTest(token).run(SEQUENCES, FLOWS)
 
 
+@default_chain.connect(accounts=20)
+def test_oz_fuzz_batched():
+    token = _deploy_erc20(OZERC20)
+    ERC20FuzzTest(token, batch_size=10).run(SEQUENCES, FLOWS)
+
+
 @default_chain.connect(accounts=20)
 def test_pure_fuzz():
     token = _deploy_erc20(PureERC20)
@@ -55,3 +63,36 @@ def test_solady_fuzz():
 def test_solmate_fuzz():
     token = _deploy_erc20(SolmateERC20)
     ERC20FuzzTest(token).run(SEQUENCES, FLOWS)
+
+
+@default_chain.connect(accounts=20)
+def test_multi_fuzz():
+    tokens = [
+        _deploy_erc20(token_class)
+        for token_class in (
+            BoringERC20,
+            OZERC20,
+            PureERC20,
+            SoladyERC20,
+            SolmateERC20,
+        )
+    ]
+    ERC20MultiFuzzTest(tokens).run(SEQUENCES, FLOWS)
+
+
+@default_chain.connect(accounts=20)
+def test_multi_fuzz_batched():
+    tokens = [_deploy_erc20(token_class) for token_class in (OZERC20, SolmateERC20)]
+    ERC20MultiFuzzTest(tokens, batch_size=10).run(SEQUENCES, FLOWS)
+
+
+def test_parallel_needs_node_per_worker():
+    # workers sharing a node would revert each other's snapshots
+    with pytest.raises(ValueError, match="every worker needs its own node"):
+        run_fuzz_parallel(
+            _deploy_erc20,
+            SEQUENCES,
+            FLOWS,
+            workers=3,
+            chain_uris=["ws://127.0.0.1:8545", "ws://127.0.0.1:8546"],
+        )
@@ -0,0 +1,64 @@
+import random
+
+from wake.testing import *
+from wake_tests.erc20.mock import ERC20Mock
+
+
+ACCOUNTS = [Address(i) for i in range(1, 6)]
+
+
+def _state(mock: ERC20Mock):
+    # addresses stay interned after a revert, with zero balances
+    balances = {a: balance for a, balance in mock.balances.items() if balance != 0}
+    return mock.total_supply, balances, mock.allowances
+
+
+def _random_write(mock: ERC20Mock) -> None:
+    owner, other = random.sample(ACCOUNTS, 2)
+    operation = random.choice(["mint", "burn", "transfer", "approve"])
+    if operation == "mint":
+        mock.mint(owner, random.randint(0, 1000))
+    elif operation == "burn":
+        mock.burn(owner, random.randint(0, mock.balanceOf(owner)))
+    elif operation == "transfer":
+        mock.transfer(owner, other, random.randint(0, mock.balanceOf(owner)))
+    else:
+        mock.approve(owner, other, random.randint(0, 1000))
+    assert mock.balances_sum == sum(mock.balances.values())
+
+
+def test_mock_revert():
+    random.seed(0)
+    mock = ERC20Mock(initial_supply=3000, initial_balances={ACCOUNTS[0]: 3000})
+    for _ in range(50):
+        states = []
+        for _ in range(random.randint(1, 4)):
+            states.append(_state(mock))
+            mock.snapshot()
+            for _ in range(random.randint(0, 30)):
+                _random_write(mock)
+
+        # revert one or more snapshots at once, the latest first
+        while states:
+            snapshot_id = random.randrange(len(states))
+            mock.revert(snapshot_id)
+            assert _state(mock) == states[snapshot_id]
+            assert mock.balances_sum == sum(mock.balances.values())
+            del states[snapshot_id:]
+        assert mock._journal == []
+
+        # the state is kept between the rounds
+        for _ in range(random.randint(0, 5)):
+            _random_write(mock)
+
+
+def test_mock_journal_size():
+    mock = ERC20Mock()
+    mock.snapshot()
+    for amount in range(100):
+        mock.mint(ACCOUNTS[0], amount)
+        mock.approve(ACCOUNTS[0], ACCOUNTS[1], amount)
+    # the first write of each key restores it
+    assert len(mock._journal) == 3
+    mock.revert(0)
+    assert _state(mock) == (0, {}, {})
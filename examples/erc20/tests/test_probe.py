@@ -0,0 +1,62 @@
+import pytest
+
+from wake.testing import *
+from wake_tests.erc20 import ERC20FuzzTest
+from wake_tests.erc20.IERC20 import IERC20
+from wake_tests.erc20.differential import ERC20DifferentialTest
+from wake_tests.erc20.mock import ERC20Mock
+
+from pytypes.contracts.BoringERC20 import BoringERC20
+from pytypes.contracts.OZERC20 import OZERC20
+from pytypes.contracts.PureERC20 import ERC20 as PureERC20
+from pytypes.contracts.SoladyERC20 import SoladyERC20
+from pytypes.contracts.SolmateERC20 import SolmateERC20
+
+
+TOKENS = [BoringERC20, OZERC20, PureERC20, SoladyERC20, SolmateERC20]
+
+
+def _deploy_erc20(token_class) -> Account:
+    owner = default_chain.accounts[0]
+    default_chain.set_default_accounts(owner)
+    return token_class.deploy(0)
+
+
+@pytest.mark.parametrize(
+    "token_class", TOKENS, ids=lambda token_class: token_class.__name__
+)
+@default_chain.connect(accounts=5)
+def test_probe_matches_snapshot(token_class):
+    token = _deploy_erc20(token_class)
+    erc20 = IERC20(token.address)
+    call = ERC20DifferentialTest(erc20, ERC20Mock(), probe_engine="call")
+    snapshot = ERC20DifferentialTest(erc20, ERC20Mock(), probe_engine="snapshot")
+
+    accounts = [account.address for account in default_chain.accounts]
+    owner, spender, receiver = accounts[:3]
+    call.mint(owner, 1000)
+    erc20.approve(spender, 500, from_=owner)
+    for amount in (0, 1, 500, 501, 1000, 1001):
+        for target in (receiver, owner, Address.ZERO):
+            assert call.try_transfer_and_restore(
+                owner, target, amount
+            ) == snapshot.try_transfer_and_restore(owner, target, amount)
+            assert call.try_transferFrom_and_restore(
+                owner, spender, target, amount
+            ) == snapshot.try_transferFrom_and_restore(owner, spender, target, amount)
+        for target in (spender, Address.ZERO):
+            assert call.try_approve_and_restore(
+                owner, target, amount
+            ) == snapshot.try_approve_and_restore(owner, target, amount)
+
+    # a failing probe silently falls back to "snapshot"
+    assert call.probe_engine == "call"
+    assert erc20.balanceOf(owner) == 1000
+
+
+@default_chain.connect(accounts=20)
+def test_probe_fuzz():
+    token = _deploy_erc20(OZERC20)
+    test = ERC20FuzzTest(token, probe_engine="call")
+    test.run(3, 50)
+    assert test.test_wrapper.probe_engine == "call"
@@ -0,0 +1,31 @@
+from wake.testing import *
+from wake_tests.erc20 import ERC20Minimal
+
+from pytypes.contracts.OZERC20 import OZERC20
+
+
+# the classes run in this order: the session chain must be disconnected before
+# the function-scoped class and the plain test connect their own chains
+
+
+class Base(ERC20Minimal):
+    token_class = OZERC20
+
+    @classmethod
+    def deploy_token(cls) -> Account:
+        owner = default_chain.accounts[0]
+        default_chain.set_default_accounts(owner)
+        return cls.token_class.deploy(cls.initial_supply)
+
+
+class TestSessionERC20(Base):
+    chain_scope = "session"
+
+
+class TestFunctionERC20(Base):
+    chain_scope = "function"
+
+
+@default_chain.connect()
+def test_connect_after_session():
+    assert default_chain.connected
@@ -0,0 +1,30 @@
+import pytest
+
+from wake.testing import *
+from wake_tests.erc20.IERC20 import IERC20
+from wake_tests.erc20.state import (
+    AbiStateReader,
+    StorageStateReader,
+    create_state_reader,
+)
+
+from pytypes.contracts.OZERC20 import OZERC20
+
+
+@pytest.mark.parametrize("use_dump", [False, True], ids=["get_storage_at", "dump"])
+@default_chain.connect(accounts=5)
+def test_storage_reader(use_dump):
+    owner = default_chain.accounts[0]
+    default_chain.set_default_accounts(owner)
+    token = OZERC20.deploy(1000)
+    accounts = [account.address for account in default_chain.accounts]
+    for i, spender in enumerate(accounts):
+        token.approve(spender, i + 1)
+
+    reader = create_state_reader(token, storage_reads=True, use_dump=use_dump)
+    assert isinstance(reader, StorageStateReader) and reader.use_dump == use_dump
+
+    expected = AbiStateReader(IERC20(token.address))
+    pairs = [(o, s) for o in accounts for s in accounts]
+    assert reader.balances(accounts) == expected.balances(accounts)
+    assert reader.allowances(pairs) == expected.allowances(pairs)
@@ -4,3 +4,6 @@ from .suite_recommended import ERC20Recommended
 from .suite_desirable import ERC20Desirable
 from .suite_fingerprint import ERC20Fingerprint
 from .fuzz import ERC20FuzzTest
+from .multi import ERC20MultiFuzzTest
+from .parallel import run_fuzz_parallel, FuzzReport
+from .abi import check_abi_conformance
@@ -0,0 +1,99 @@
+import inspect
+from typing import Dict, List, Tuple
+
+from .utils import keccak256_hash, selector
+
+
+# signature -> (input types, output types)
+REQUIRED_FUNCTIONS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "totalSupply()": ((), ("uint256",)),
+    "balanceOf(address)": (("address",), ("uint256",)),
+    "transfer(address,uint256)": (("address", "uint256"), ("bool",)),
+    "transferFrom(address,address,uint256)": (
+        ("address", "address", "uint256"),
+        ("bool",),
+    ),
+    "approve(address,uint256)": (("address", "uint256"), ("bool",)),
+    "allowance(address,address)": (("address", "address"), ("uint256",)),
+}
+
+OPTIONAL_FUNCTIONS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "name()": ((), ("string",)),
+    "symbol()": ((), ("string",)),
+    "decimals()": ((), ("uint8",)),
+}
+
+# not a part of EIP-20, but common (and deprecated by OpenZeppelin)
+NON_STANDARD_FUNCTIONS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "increaseAllowance(address,uint256)": (("address", "uint256"), ("bool",)),
+    "decreaseAllowance(address,uint256)": (("address", "uint256"), ("bool",)),
+}
+
+# signature -> number of leading indexed arguments
+EVENTS: Dict[str, int] = {
+    "Transfer(address,address,uint256)": 2,
+    "Approval(address,address,uint256)": 2,
+}
+
+
+def check_function(token, signature: str, signature_only: bool = False) -> List[str]:
+    """Check a function of the tables above in the ABI of a pytypes contract class
+    (or instance); with `signature_only`, only its presence is checked."""
+    fn_abi = token._abi.get(selector(signature))
+    if fn_abi is None:
+        return [f"The {signature} selector is not present in the ABI."]
+    if signature_only:
+        return []
+
+    inputs, outputs = {
+        **REQUIRED_FUNCTIONS,
+        **OPTIONAL_FUNCTIONS,
+        **NON_STANDARD_FUNCTIONS,
+    }[signature]
+    problems = []
+    got_inputs = tuple(i["internalType"] for i in fn_abi["inputs"])
+    if got_inputs != inputs:
+        problems.append(
+            f"{signature} should have arguments {inputs}, got {got_inputs}."
+        )
+    got_outputs = tuple(o["internalType"] for o in fn_abi["outputs"])
+    if got_outputs != outputs:
+        problems.append(
+            f"{signature} should have outputs {outputs}, got {got_outputs}."
+        )
+    return problems
+
+
+def check_event(token, signature: str) -> List[str]:
+    """Check an event of `EVENTS` in a pytypes contract class (or instance)."""
+    indexed = EVENTS[signature]
+    name = signature[: signature.index("(")]
+    event = getattr(token, name, None)
+    if not inspect.isclass(event):
+        return [f"The {name} event is not present in the contract."]
+    if event.selector != keccak256_hash(signature):
+        return [
+            f"The {name} event signature does not match {signature}. "
+            f"Expected {keccak256_hash(signature)}, got {event.selector}"
+        ]
+    inputs = event._abi["inputs"]
+    if not all(i["indexed"] for i in inputs[:indexed]):
+        return [f"The {name} event should have {indexed} indexed arguments."]
+    return []
+
+
+def check_abi_conformance(token, optional: bool = True) -> List[str]:
+    """Check the functions and events of a pytypes contract class (or instance)
+    against EIP-20 in one pass, without a chain. Returns the list of problems,
+    empty if the token conforms. The optional functions are checked only if
+    `optional` is set."""
+    signatures = list(REQUIRED_FUNCTIONS)
+    if optional:
+        signatures.extend(OPTIONAL_FUNCTIONS)
+
+    problems = []
+    for signature in signatures:
+        problems.extend(check_function(token, signature))
+    for signature in EVENTS:
+        problems.extend(check_event(token, signature))
+    return problems
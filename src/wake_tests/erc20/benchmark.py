@@ -0,0 +1,68 @@
+import json
+import random
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from wake.testing import *
+
+from .fuzz import ERC20FuzzTest
+from .instrumentation import Instrumentation, get_report
+
+
+def benchmark_fuzz(
+    token_name: str,
+    deploy: Callable[[], Account],
+    sequences_count: int,
+    flows_count: int,
+    report_path: str,
+    *,
+    seed: int = 0,
+    chain_kwargs: Optional[Dict[str, Any]] = None,
+    **fuzz_kwargs,
+) -> Dict[str, Any]:
+    """Connect a chain, deploy the token and run `ERC20FuzzTest` seeded with `seed`
+    while recording requests, phase timings, gas and peak RSS. The summary is
+    added to the report at `report_path` (test "fuzz") and returned."""
+    random.seed(seed)
+    instrumentation = Instrumentation()
+    with instrumentation.record(), instrumentation.phase("total"), ExitStack() as stack:
+        with instrumentation.phase("connect"):
+            stack.enter_context(default_chain.connect(**(chain_kwargs or {})))
+        stack.enter_context(instrumentation.track_gas())
+        with instrumentation.phase("deploy"):
+            token = deploy()
+        ERC20FuzzTest(token, instrumentation=instrumentation, **fuzz_kwargs).run(
+            sequences_count, flows_count
+        )
+
+    report = get_report(report_path)
+    report.add(token_name, "fuzz", instrumentation)
+    report.write()
+    return report.rows[-1]
+
+
+def compare_reports(
+    baseline_path: str,
+    path: str,
+    columns: Sequence[str] = ("total_time", "requests"),
+    tolerance: float = 0.1,
+) -> List[str]:
+    """Compare two JSON reports row by row (token, test) and return the values of
+    `columns` that grew by more than `tolerance` (relative) since the baseline."""
+    with open(baseline_path) as f:
+        baseline = {(row["token"], row["test"]): row for row in json.load(f)}
+    with open(path) as f:
+        rows = json.load(f)
+
+    regressions = []
+    for row in rows:
+        base = baseline.get((row["token"], row["test"]))
+        if base is None:
+            continue
+        for column in columns:
+            old, new = base.get(column, 0), row.get(column, 0)
+            if new > old * (1 + tolerance):
+                regressions.append(
+                    f"{row['token']} {row['test']} {column}: {old} -> {new}"
+                )
+    return regressions
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from wake.testing import *
+
+
+# a flow executed by `ERC20FuzzTest`, e.g.
+#   {"operation": "transfer", "owner": 0, "receiver": "0x...", "amount": 100}
+# addresses are stored as indices of `default_chain.accounts` when possible
+Step = Dict[str, Any]
+# kind of a warning recorded by a sequence: (category name, operation, outcome)
+DiagnosticKind = Tuple[str, str, str]
+
+
+@dataclass
+class CorpusEntry:
+    steps: List[Step]
+    # traceback of the failure, None for an interesting passing sequence
+    failure: Optional[str] = None
+    path: Optional[str] = None
+    # kinds of warnings produced by the sequence when it was saved
+    diagnostics: List[DiagnosticKind] = field(default_factory=list)
+
+
+def encode_address(
+    address: Address, account_indices: Dict[Address, int]
+) -> Union[int, str]:
+    index = account_indices.get(address)
+    return index if index is not None else str(address)
+
+
+def decode_address(value: Union[int, str]) -> Address:
+    if isinstance(value, int):
+        return default_chain.accounts[value].address
+    return Address(value)
+
+
+def save_sequence(
+    directory: str,
+    steps: List[Step],
+    failure: Optional[str] = None,
+    diagnostics: Iterable[DiagnosticKind] = (),
+) -> str:
+    """Write the sequence to `directory` and return the path of the file. The
+    file name is derived from the steps, so the same sequence is stored once."""
+    os.makedirs(directory, exist_ok=True)
+    data = json.dumps(steps, sort_keys=True)
+    digest = hashlib.sha1(data.encode()).hexdigest()[:16]
+    kind = "failure" if failure is not None else "sequence"
+    path = os.path.join(directory, f"{kind}-{digest}.json")
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "failure": failure,
+                "diagnostics": sorted(diagnostics),
+                "steps": steps,
+            },
+            f,
+            indent=4,
+        )
+    return path
+
+
+def load_sequence(path: str) -> CorpusEntry:
+    with open(path) as f:
+        data = json.load(f)
+    return CorpusEntry(
+        steps=data["steps"],
+        failure=data.get("failure"),
+        path=path,
+        diagnostics=[tuple(kind) for kind in data.get("diagnostics", [])],
+    )
+
+
+def load_corpus(directory: str) -> List[CorpusEntry]:
+    """Load all sequences of the corpus, the failures first."""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(
+        (name for name in os.listdir(directory) if name.endswith(".json")),
+        key=lambda name: (not name.startswith("failure-"), name),
+    )
+    return [load_sequence(os.path.join(directory, name)) for name in names]
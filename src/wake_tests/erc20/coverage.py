@@ -0,0 +1,76 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Set, Tuple, Union
+
+from wake.testing import *
+
+
+# struct logs without the parts not needed for the control flow
+_TRACE_OPTIONS = {
+    "disableStack": True,
+    "disableStorage": True,
+    "enableMemory": False,
+    "enableReturnData": False,
+}
+
+
+class TokenCoverage:
+    """Branch coverage of transactions sent to the token, collected from the struct
+    logs of `debug_traceTransaction`. An edge is a JUMPI together with the pc
+    executed after it (the jump destination or the next instruction) and the call
+    depth, so calls to other contracts made by the token are covered too."""
+
+    def __init__(self, token: Union[Account, Address]) -> None:
+        self.address = token.address if isinstance(token, Account) else token
+        self.edges: Set[Tuple[int, int, int]] = set()
+        self.transactions = 0
+        # (seconds since the start, traced transactions, edges) on every new edge
+        self.history: List[Tuple[float, int, int]] = []
+        self._start = time.perf_counter()
+
+    def add(self, tx: TransactionAbc) -> int:
+        """Trace the transaction and return the number of new edges."""
+        trace = default_chain.chain_interface.debug_trace_transaction(
+            tx.tx_hash, _TRACE_OPTIONS
+        )
+        self.transactions += 1
+        count = len(self.edges)
+        previous = None
+        for log in trace["structLogs"]:
+            if previous is not None and previous["op"] == "JUMPI":
+                self.edges.add((previous["depth"], previous["pc"], log["pc"]))
+            previous = log
+        new = len(self.edges) - count
+        if new > 0:
+            elapsed = round(time.perf_counter() - self._start, 6)
+            self.history.append((elapsed, self.transactions, len(self.edges)))
+        return new
+
+    @contextmanager
+    def track(self):
+        """Collect the coverage of the token transactions of `default_chain`."""
+        previous = default_chain.tx_callback
+
+        def callback(tx) -> None:
+            if tx.to is not None and tx.to.address == self.address:
+                self.add(tx)
+            if previous is not None:
+                previous(tx)
+
+        default_chain.tx_callback = callback
+        try:
+            yield self
+        finally:
+            default_chain.tx_callback = previous
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "edges": len(self.edges),
+            "transactions": self.transactions,
+            "history": self.history,
+        }
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=4)
@@ -0,0 +1,64 @@
+import warnings
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, NamedTuple, Tuple, Type
+
+
+class Diagnostic(NamedTuple):
+    category: Type[Warning]
+    # token function, e.g. "transferFrom"
+    operation: str
+    # what happened, e.g. "returned false"
+    outcome: str
+    # (name, value) pairs of the call arguments
+    args: Tuple[Tuple[str, Any], ...]
+
+    @property
+    def call(self) -> str:
+        args = ", ".join(f"{name.rstrip('_')}={value}" for name, value in self.args)
+        return f"{self.operation}({args})"
+
+    def __str__(self) -> str:
+        return f"{self.call} {self.outcome}"
+
+
+class Diagnostics:
+    """Warnings recorded as data during a test. Occurrences are counted per
+    (category, operation, outcome) with at most `max_samples` distinct argument
+    sets kept for each, so the memory does not grow with the number of calls.
+    The messages are formatted only when `emit` is called."""
+
+    def __init__(self, max_samples: int = 3) -> None:
+        self.max_samples = max_samples
+        self.counts: Counter = Counter()
+        self.samples: Dict[Tuple[Type[Warning], str, str], List[Diagnostic]] = (
+            defaultdict(list)
+        )
+
+    def record(
+        self, category: Type[Warning], operation: str, outcome: str, **args: Any
+    ) -> None:
+        key = (category, operation, outcome)
+        self.counts[key] += 1
+        samples = self.samples[key]
+        if len(samples) < self.max_samples:
+            diagnostic = Diagnostic(category, operation, outcome, tuple(args.items()))
+            if diagnostic not in samples:
+                samples.append(diagnostic)
+
+    def emit(self) -> None:
+        """Issue one summary warning per category and clear the records."""
+        lines: Dict[Type[Warning], List[str]] = defaultdict(list)
+        for (category, operation, outcome), count in self.counts.items():
+            times = "once" if count == 1 else f"{count} times"
+            lines[category].append(f"{operation} {outcome}: {times}, e.g.")
+            lines[category].extend(
+                f"    {sample.call}"
+                for sample in self.samples[category, operation, outcome]
+            )
+        for category, category_lines in lines.items():
+            warnings.warn("\n".join(category_lines), category)
+        self.clear()
+
+    def clear(self) -> None:
+        self.counts.clear()
+        self.samples.clear()
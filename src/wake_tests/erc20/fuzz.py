@@ -1,9 +1,37 @@
+# the global generator seeded by wake, see generators.py
+import random
+import traceback
+import warnings
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from typing import Iterable, List, Set, Tuple, Union
+
 from wake.testing import *
 from wake.testing.fuzzing import *
 
 from .IERC20 import IERC20
-from .differential import ERC20DifferentialTest
+from .corpus import (
+    DiagnosticKind,
+    Step,
+    decode_address,
+    encode_address,
+    load_corpus,
+    load_sequence,
+    save_sequence,
+)
+from .coverage import TokenCoverage
+from .differential import BATCH_GAS_LIMIT, ERC20DifferentialTest
+from .generators import (
+    boundary_amount,
+    random_approver,
+    random_holder,
+    random_recipient,
+)
+from .instrumentation import Instrumentation
 from .mock import ERC20Mock, Balances, Allowances
+from .shrink import shrink_sequence
+from .state import StateReader, create_state_reader
+from .utils import UINT256_MAX
 
 
 class ERC20FuzzTest(FuzzTest):
@@ -16,7 +44,47 @@ class ERC20FuzzTest(FuzzTest):
         decimals: uint8 = 18,
         mint_amount: uint = 300,
         static_max_allowance: bool = True,
+        storage_reads: bool = False,
+        storage_dump: bool = False,
+        probe_engine: str = "snapshot",
+        instrumentation: Optional[Instrumentation] = None,
+        batch_size: int = 1,
+        batch_gas_limit: int = BATCH_GAS_LIMIT,
+        corpus_dir: Optional[str] = None,
+        shrink_failures: bool = False,
+        coverage_guided: bool = False,
+        boundary_prob: float = 0.5,
+        invariant_period: int = 0,
+        full_check: bool = False,
     ) -> None:
+        """With `batch_size` > 1, automine is turned off and the operations of up to
+        `batch_size` flows are sent with `batch_gas_limit` and mined in one block
+        before they are verified. Operations with the zero address are executed
+        one by one as usual.
+
+        With `corpus_dir`, failing sequences and sequences producing a new kind of
+        warning are saved there as JSON files. The saved sequences are replayed
+        before the first run, see also `replay`. With `shrink_failures`, a failing
+        sequence is also shrunk (see `shrink`) and the result is saved there too.
+
+        With `coverage_guided`, token transactions are traced into `self.coverage`
+        and the steps reaching new branches are mutated by `flow_mutate`. With
+        `corpus_dir` as well, the sequences reaching branches not covered by the
+        corpus yet are saved there. Requires a node supporting
+        `debug_traceTransaction`.
+
+        With `boundary_prob`, a flow picks its arguments by the state of the mock:
+        accounts holding tokens (or having an allowance) and amounts at the
+        boundaries of their balance and allowance (see `boundary_amount`).
+
+        The total supply, balances and allowances are compared with the mock at the
+        end of every sequence and, with `invariant_period` > 0, also after every
+        `invariant_period`-th flow. By default, only the balances and allowances
+        changed since the last check are read. With `full_check`, all accounts and
+        pairs of accounts are read (in batches)."""
+        assert (
+            not shrink_failures or corpus_dir is not None
+        ), "shrink_failures requires corpus_dir"
         self.token = token
         self.initial_supply = initial_supply
         self.initial_balances = initial_balances
@@ -24,36 +92,389 @@ class ERC20FuzzTest(FuzzTest):
         self.erc20 = IERC20(token.address)
         self.pre_mint = mint_amount * 10**decimals
         self.static_max_allowance = static_max_allowance
+        self.storage_reads = storage_reads
+        self.storage_dump = storage_dump
+        self.state_reader = create_state_reader(
+            token, storage_reads, use_dump=storage_dump
+        )
+        self.probe_engine = probe_engine
+        self.instrumentation = instrumentation
+        self.batch_size = batch_size
+        self.batch_gas_limit = batch_gas_limit
+        self.corpus_dir = corpus_dir
+        self.shrink_failures = shrink_failures
+        self.boundary_prob = boundary_prob
+        self.invariant_period = invariant_period
+        self.full_check = full_check
+        self._unchecked_flows = 0
+        self._dry_run = False
+        self.coverage = TokenCoverage(token.address) if coverage_guided else None
+        # steps that reached new coverage, the inputs of `flow_mutate`
+        self.interesting: List[Step] = []
+        self._tracking = False
+        # steps of the current sequence
+        self.steps: List[Step] = []
+        self._corpus_replayed = False
+        # kinds of warnings already in the corpus, kept over all runs
+        self._seen_diagnostics: Set[DiagnosticKind] = set()
+        # edges covered by the corpus, not reset by `reset_coverage`
+        self._corpus_edges: Set[Tuple[int, int, int]] = set()
+        # number of executed flows by name over all sequences
+        self.flows_counter = Counter()
         super().__init__()
 
-    def pre_sequence(self) -> None:
-        self.erc20_mock = ERC20Mock(
+    def run(self, sequences_count: int, flows_count: int, *, dry_run: bool = False):
+        """Mint once and start every sequence from the same checkpoint; the mock
+        is reverted to it by its journal instead of being rebuilt."""
+        self._dry_run = dry_run
+        try:
+            with self._campaign():
+                if self.corpus_dir is not None and not self._corpus_replayed:
+                    self._corpus_replayed = True
+                    corpus = load_corpus(self.corpus_dir)
+                    for entry in corpus:
+                        self._seen_diagnostics.update(entry.diagnostics)
+                    for entry in corpus:
+                        self._replay_sequence(entry.steps)
+                super().run(sequences_count, flows_count, dry_run=dry_run)
+        except Exception:
+            if self.corpus_dir is not None:
+                steps = self.steps
+                save_sequence(self.corpus_dir, steps, traceback.format_exc())
+                if self.shrink_failures:
+                    # the chain is back at the state before the run
+                    try:
+                        self.shrink(steps)
+                    except Exception as e:
+                        # e.g. a flaky failure, report the original one anyway
+                        warnings.warn(
+                            f"Shrinking the failing sequence failed: {e!r}",
+                            RuntimeWarning,
+                        )
+            raise
+
+    def replay(self, steps: Union[str, Iterable[Step]]) -> None:
+        """Execute a sequence of steps (or the corpus file at the given path)
+        from the post-mint checkpoint without generating anything."""
+        if isinstance(steps, str):
+            steps = load_sequence(steps).steps
+        with self._campaign():
+            self._replay_sequence(steps)
+
+    def shrink(
+        self, steps: Union[str, List[Step]], max_attempts: int = 5000
+    ) -> List[Step]:
+        """Shrink a failing sequence (or the corpus file at the given path) to
+        a minimal one failing at the same place, i.e. raising the same exception
+        type from the same line. Every attempt is replayed from the post-mint
+        checkpoint. The result is saved to the corpus if `corpus_dir` is set."""
+        if isinstance(steps, str):
+            steps = load_sequence(steps).steps
+        corpus_dir, self.corpus_dir = self.corpus_dir, None
+        try:
+            with self._campaign(track_coverage=False):
+                failure = self._replay_failure(steps)
+                assert failure is not None, "The sequence does not fail"
+                location = _failure_location(failure)
+
+                def fails(candidate: List[Step]) -> bool:
+                    error = self._replay_failure(candidate)
+                    return error is not None and _failure_location(error) == location
+
+                shrunk = shrink_sequence(
+                    steps, fails, len(default_chain.accounts), max_attempts
+                )
+                failure = self._replay_failure(shrunk)
+        finally:
+            self.corpus_dir = corpus_dir
+        if corpus_dir is not None:
+            save_sequence(
+                corpus_dir,
+                shrunk,
+                "".join(
+                    traceback.format_exception(
+                        type(failure), failure, failure.__traceback__
+                    )
+                ),
+            )
+        return shrunk
+
+    def reset_coverage(self) -> None:
+        """Forget the collected coverage and the steps kept for `flow_mutate`, so
+        that the next sequence does not depend on the ones run before it."""
+        if self.coverage is not None:
+            self.coverage = TokenCoverage(self.coverage.address)
+        self.interesting = []
+
+    def _replay_failure(self, steps: Iterable[Step]) -> Optional[Exception]:
+        try:
+            self._replay_sequence(steps)
+        except Exception as e:
+            return e
+        finally:
+            # warnings of the attempts are not reported
+            for wrapper in self.test_wrappers:
+                wrapper.diagnostics.clear()
+        return None
+
+    @contextmanager
+    def _campaign(self, track_coverage: bool = True):
+        with self._snapshot_and_revert(), ExitStack() as stack:
+            if self.coverage is not None and track_coverage:
+                stack.enter_context(self.coverage.track())
+                self._tracking = True
+                stack.callback(setattr, self, "_tracking", False)
+            self._setup()
+            # the chain is reverted to the post-mint state after each sequence
+            self._checkpoints = [w.erc20_mock.snapshot() for w in self.test_wrappers]
+            self._account_indices = {
+                account.address: i for i, account in enumerate(default_chain.accounts)
+            }
+            try:
+                yield
+            finally:
+                for wrapper in self.test_wrappers:
+                    wrapper.diagnostics.emit()
+
+    @contextmanager
+    def _snapshot_and_revert(self):
+        """Revert the chain when the block exits, also after an exception left
+        operations queued and automine off."""
+        with default_chain.snapshot_and_revert():
+            try:
+                yield
+            finally:
+                for wrapper in getattr(self, "test_wrappers", []):
+                    wrapper.discard_queue()
+
+    def _replay_sequence(self, steps: Iterable[Step]) -> None:
+        with self._snapshot_and_revert():
+            self.pre_sequence()
+            for step in steps:
+                self.execute(step)
+                if self._queued() >= self.batch_size:
+                    self._flush()
+                if not self._dry_run:
+                    self.invariant_token_state()
+            self.post_sequence()
+
+    def _setup(self) -> None:
+        self.test_wrapper = self._create_wrapper(self.erc20, self.state_reader)
+        self.erc20_mock = self.test_wrapper.erc20_mock
+        # all tested tokens, see `ERC20MultiFuzzTest`
+        self.test_wrappers = [self.test_wrapper]
+
+    def _create_wrapper(
+        self, erc20: IERC20, state_reader: StateReader
+    ) -> ERC20DifferentialTest:
+        """A differential test of the token with a new mock, after the pre-mint."""
+        erc20_mock = ERC20Mock(
             initial_supply=self.initial_supply,
             initial_balances=self.initial_balances,
             initial_allowances=self.initial_allowances,
             static_max_allowance=self.static_max_allowance,
         )
-        self.test_wrapper = ERC20DifferentialTest(self.erc20, self.erc20_mock)
+        wrapper = ERC20DifferentialTest(
+            erc20,
+            erc20_mock,
+            full_check_period=1 if self.full_check else 0,
+            state_reader=state_reader,
+            probe_engine=self.probe_engine,
+            instrumentation=self.instrumentation,
+            batch_gas_limit=self.batch_gas_limit,
+        )
 
         to = default_chain.default_tx_account
-        self.test_wrapper.mint(to, self.pre_mint)
+        wrapper.mint(to, self.pre_mint)
+        return wrapper
+
+    def pre_sequence(self) -> None:
+        # reverting consumes the snapshot
+        for wrapper, checkpoint in zip(self.test_wrappers, self._checkpoints):
+            wrapper.erc20_mock.revert(checkpoint)
+        self._checkpoints = [w.erc20_mock.snapshot() for w in self.test_wrappers]
+        self.steps = []
+        self._unchecked_flows = 0
         return super().pre_sequence()
 
+    def post_flow(self, flow) -> None:
+        self.flows_counter[flow.__name__] += 1
+        if self._queued() >= self.batch_size:
+            self._flush()
+        return super().post_flow(flow)
+
+    def post_sequence(self) -> None:
+        self._flush()
+        if not self._dry_run:
+            self.check_invariants()
+        if self.corpus_dir is not None:
+            diagnostics = {
+                (category.__name__, operation, outcome)
+                for wrapper in self.test_wrappers
+                for category, operation, outcome in wrapper.diagnostics.counts
+            }
+            edges = set() if self.coverage is None else self.coverage.edges
+            new_edges = edges - self._corpus_edges
+            if new_edges or not diagnostics <= self._seen_diagnostics:
+                self._seen_diagnostics |= diagnostics
+                self._corpus_edges |= new_edges
+                save_sequence(self.corpus_dir, self.steps, diagnostics=diagnostics)
+        return super().post_sequence()
+
+    @invariant()
+    def invariant_token_state(self) -> None:
+        self._unchecked_flows += 1
+        if self.invariant_period == 0 or self._unchecked_flows < self.invariant_period:
+            return
+        # checking would flush the batch early, wait for it
+        if self._queued() == 0:
+            self.check_invariants()
+
+    def check_invariants(self) -> None:
+        self._unchecked_flows = 0
+        for wrapper in self.test_wrappers:
+            wrapper.assert_total_supply_matches_expected()
+            wrapper.assert_balances_match_expected()
+            wrapper.assert_allowances_match_expected()
+
+    def _queued(self) -> int:
+        return max(wrapper.queued for wrapper in self.test_wrappers)
+
+    def _flush(self) -> None:
+        for wrapper in self.test_wrappers:
+            wrapper.flush()
+
+    def execute(self, step: Step) -> None:
+        """Execute one step, either generated by a flow or loaded from the corpus."""
+        self.steps.append(step)
+        if not self._tracking:
+            self._execute(step)
+            return
+        # with batches, new coverage is found when the batch is flushed
+        edges = len(self.coverage.edges)
+        self._execute(step)
+        if len(self.coverage.edges) > edges:
+            self.interesting.append(step)
+
+    def _execute(self, step: Step) -> None:
+        for wrapper in self.test_wrappers:
+            self._execute_on(wrapper, step)
+
+    def _is_queued(self, step: Step) -> bool:
+        """Whether the step is queued into the batch, zero addresses are not."""
+        if self.batch_size <= 1:
+            return False
+        target = step["spender"] if step["operation"] == "approve" else step["receiver"]
+        return decode_address(target) != Address.ZERO
+
+    def _execute_on(self, wrapper: ERC20DifferentialTest, step: Step) -> None:
+        operation = step["operation"]
+        amount = step["amount"]
+        owner = decode_address(step["owner"])
+        queued = self._is_queued(step)
+        if operation == "approve":
+            spender = decode_address(step["spender"])
+            if queued:
+                wrapper.queue_approve(owner, spender, amount)
+            else:
+                wrapper.assert_approve(owner, spender, amount)
+        elif operation == "transfer":
+            receiver = decode_address(step["receiver"])
+            if queued:
+                wrapper.queue_transfer(owner, receiver, amount)
+            else:
+                wrapper.assert_transfer(owner, receiver, amount)
+        else:
+            spender = decode_address(step["spender"])
+            receiver = decode_address(step["receiver"])
+            if queued:
+                wrapper.queue_transferFrom(owner, spender, receiver, amount)
+            else:
+                wrapper.assert_transferFrom(owner, spender, receiver, amount)
+
+    def _encode(self, address: Union[Account, Address]) -> Union[int, str]:
+        if type(address) is Account:
+            address = address.address
+        return encode_address(address, self._account_indices)
+
     @flow()
     def flow_approve(self, amount: uint) -> None:
-        owner = random_account()
-        spender = random_address(zero_address_prob=0.01)
-        self.test_wrapper.assert_approve(owner, spender, amount)
+        if random.random() < self.boundary_prob:
+            owner = random_holder(self.erc20_mock)
+            spender = random_recipient()
+            amount = boundary_amount(
+                self.erc20_mock.balanceOf(owner),
+                self.erc20_mock.allowance(owner, spender),
+            )
+        else:
+            owner = random_account()
+            spender = random_address(zero_address_prob=0.01)
+        self.execute(
+            {
+                "operation": "approve",
+                "owner": self._encode(owner),
+                "spender": self._encode(spender),
+                "amount": amount,
+            }
+        )
 
     @flow()
     def flow_transfer(self, amount: uint) -> None:
-        owner = random_account()
-        receiver = random_address(zero_address_prob=0.01)
-        self.test_wrapper.assert_transfer(owner, receiver, amount)
+        if random.random() < self.boundary_prob:
+            owner = random_holder(self.erc20_mock)
+            receiver = random_recipient()
+            amount = boundary_amount(self.erc20_mock.balanceOf(owner))
+        else:
+            owner = random_account()
+            receiver = random_address(zero_address_prob=0.01)
+        self.execute(
+            {
+                "operation": "transfer",
+                "owner": self._encode(owner),
+                "receiver": self._encode(receiver),
+                "amount": amount,
+            }
+        )
 
     @flow()
     def flow_transferFrom(self, amount: uint) -> None:
-        owner = random_address(zero_address_prob=0.01)
-        receiver = random_address(zero_address_prob=0.01)
         spender = random_account()
-        self.test_wrapper.assert_transferFrom(owner, spender, receiver, amount)
+        owner = None
+        if random.random() < self.boundary_prob:
+            owner = random_approver(self.erc20_mock, spender.address)
+        if owner is not None:
+            receiver = random_recipient()
+            amount = boundary_amount(
+                self.erc20_mock.balanceOf(owner),
+                self.erc20_mock.allowance(owner, spender),
+            )
+        else:
+            owner = random_address(zero_address_prob=0.01)
+            receiver = random_address(zero_address_prob=0.01)
+        self.execute(
+            {
+                "operation": "transferFrom",
+                "owner": self._encode(owner),
+                "spender": self._encode(spender),
+                "receiver": self._encode(receiver),
+                "amount": amount,
+            }
+        )
+
+    @flow(precondition=lambda self: len(self.interesting) > 0)
+    def flow_mutate(self) -> None:
+        step = dict(random.choice(self.interesting))
+        key = random.choice([key for key in step if key != "operation"])
+        if key == "amount":
+            amount = step["amount"]
+            candidates = [0, amount - 1, amount + 1, amount // 2, amount * 2]
+            candidates.append(random_int(0, amount))
+            step["amount"] = min(max(random.choice(candidates), 0), UINT256_MAX)
+        else:
+            step[key] = random.randrange(len(default_chain.accounts))
+        self.execute(step)
+
+
+def _failure_location(error: Exception):
+    frame = traceback.extract_tb(error.__traceback__)[-1]
+    return type(error), frame.filename, frame.lineno
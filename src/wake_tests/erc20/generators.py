@@ -0,0 +1,42 @@
+# the global generator, seeded by wake and used by its random_* functions too
+import random
+from typing import List, Optional
+
+from wake.testing import *
+from wake.testing.fuzzing import *
+
+from .mock import ERC20Mock
+from .utils import UINT256_MAX
+
+
+def boundary_amount(*values: uint) -> uint:
+    """One of 0, UINT256_MAX and the given values (e.g. a balance and an allowance)
+    with their neighbours, i.e. value - 1, value and value + 1."""
+    candidates = {0, UINT256_MAX}
+    for value in values:
+        candidates.update((value - 1, value, value + 1))
+    return random.choice(sorted(c for c in candidates if 0 <= c <= UINT256_MAX))
+
+
+def random_holder(mock: ERC20Mock) -> Account:
+    """A random account with a non-zero balance, any account if there is none."""
+    holders = [a for a in default_chain.accounts if mock.balanceOf(a.address) > 0]
+    return random.choice(holders) if holders else random_account()
+
+
+def random_approver(mock: ERC20Mock, spender: Address) -> Optional[Account]:
+    """A random account that approved `spender` a non-zero amount, if any."""
+    owners: List[Account] = [
+        a for a in default_chain.accounts if mock.allowance(a.address, spender) > 0
+    ]
+    return random.choice(owners) if owners else None
+
+
+def random_recipient(zero_address_prob: float = 0.01) -> Address:
+    """The zero address with `zero_address_prob`, otherwise an account (which
+    can spend the tokens later) or a fresh address with the same probability."""
+    if random.random() < zero_address_prob:
+        return Address.ZERO
+    if random.random() < 0.5:
+        return random_account().address
+    return random_address()
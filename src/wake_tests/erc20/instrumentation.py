@@ -0,0 +1,216 @@
+import csv
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from typing import Any, Dict, List
+
+from wake.development.json_rpc.communicator import (
+    HttpProtocol,
+    IpcProtocol,
+    WebsocketProtocol,
+)
+from wake.testing import *
+
+from .IERC20 import IERC20
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+
+# anvil receives transactions of wake's accounts as eth_sendUnsignedTransaction
+_TX_METHODS = (
+    "eth_sendTransaction",
+    "eth_sendUnsignedTransaction",
+    "eth_sendRawTransaction",
+)
+
+# instrumentations currently recording requests
+_recording: List["Instrumentation"] = []
+_installed = False
+
+
+def _install() -> None:
+    """Wrap `send_recv` of all JSON-RPC protocols (once) to count the requests."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    for protocol in (HttpProtocol, IpcProtocol, WebsocketProtocol):
+        protocol.send_recv = _counting(protocol.send_recv)
+
+
+def _counting(send_recv):
+    @wraps(send_recv)
+    def wrapper(self, data: str):
+        if _recording:
+            request = json.loads(data)
+            for instrumentation in _recording:
+                instrumentation._count(request)
+        return send_recv(self, data)
+
+    return wrapper
+
+
+class Instrumentation:
+    """Counts JSON-RPC requests sent while recording and measures time spent
+    in named phases (e.g. deploy, operations, verification). Gas used by
+    transactions is collected by operation while `track_gas` is active."""
+
+    def __init__(self) -> None:
+        self.requests: Counter = Counter()
+        self.batches = 0
+        self.deployments = 0
+        self.gas: Counter = Counter()
+        self.gas_txs: Counter = Counter()
+        self.phases: Dict[str, float] = defaultdict(float)
+        self._active_phases: Counter = Counter()
+
+    @contextmanager
+    def record(self):
+        _install()
+        _recording.append(self)
+        try:
+            yield self
+        finally:
+            _recording.remove(self)
+
+    @contextmanager
+    def track_gas(self):
+        """Collect gas used by the transactions of the connected `default_chain`."""
+        previous = default_chain.tx_callback
+
+        def callback(tx) -> None:
+            if tx.to is None:
+                operation = "deploy"
+            else:
+                operation = _operation_names().get(tx.data[:4], "other")
+            self.gas[operation] += tx.gas_used
+            self.gas_txs[operation] += 1
+            if previous is not None:
+                previous(tx)
+
+        default_chain.tx_callback = callback
+        try:
+            yield self
+        finally:
+            default_chain.tx_callback = previous
+
+    @contextmanager
+    def phase(self, name: str):
+        # nested phases of the same name are measured only once
+        self._active_phases[name] += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active_phases[name] -= 1
+            if self._active_phases[name] == 0:
+                self.phases[name] += time.perf_counter() - start
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {
+            "requests": sum(self.requests.values()),
+            "batches": self.batches,
+            "eth_calls": self.requests["eth_call"],
+            "transactions": sum(self.requests[method] for method in _TX_METHODS),
+            "deployments": self.deployments,
+            "snapshots": self.requests["evm_snapshot"],
+            "reverts": self.requests["evm_revert"],
+        }
+        for name, duration in self.phases.items():
+            summary[f"{name}_time"] = round(duration, 6)
+        for operation, gas in self.gas.items():
+            summary[f"{operation}_gas"] = gas
+            summary[f"{operation}_txs"] = self.gas_txs[operation]
+        if resource is not None:
+            # peak of the whole process so far, in kilobytes on Linux
+            summary["peak_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return summary
+
+    def _count(self, request) -> None:
+        if isinstance(request, list):
+            self.batches += 1
+        else:
+            request = [request]
+        for r in request:
+            self.requests[r["method"]] += 1
+            if r["method"] in ("eth_sendTransaction", "eth_sendUnsignedTransaction"):
+                # deployments have no recipient
+                if not r["params"][0].get("to"):
+                    self.deployments += 1
+
+
+@lru_cache(maxsize=1)
+def _operation_names() -> Dict[bytes, str]:
+    return {
+        selector: abi["name"]
+        for selector, abi in IERC20._abi.items()
+        if abi["type"] == "function"
+    }
+
+
+def timed(phase: str):
+    """Measure the method in `phase` of `self.instrumentation` if set."""
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            if self.instrumentation is None:
+                return fn(self, *args, **kwargs)
+            with self.instrumentation.phase(phase):
+                return fn(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class InstrumentationReport:
+    """Rows of per-test summaries written to a JSON or CSV file (by extension)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.rows: List[Dict[str, Any]] = []
+
+    def add(self, token: str, test: str, instrumentation: Instrumentation) -> None:
+        self.rows.append({"token": token, "test": test, **instrumentation.summary()})
+
+    def add_total(self, token: str) -> None:
+        total: Dict[str, Any] = defaultdict(int)
+        for row in self.rows:
+            if row["token"] == token and row["test"] != "total":
+                for key, value in row.items():
+                    if key == "peak_rss":
+                        total[key] = max(total[key], value)
+                    elif key not in ("token", "test"):
+                        total[key] += value
+        for key, value in total.items():
+            if isinstance(value, float):
+                total[key] = round(value, 6)
+        self.rows.append({"token": token, "test": "total", **total})
+
+    def write(self) -> None:
+        with open(self.path, "w", newline="") as f:
+            if self.path.endswith(".csv"):
+                columns = list(dict.fromkeys(key for row in self.rows for key in row))
+                writer = csv.DictWriter(f, fieldnames=columns, restval=0)
+                writer.writeheader()
+                writer.writerows(self.rows)
+            else:
+                json.dump(self.rows, f, indent=4)
+
+
+# reports of the whole session by path
+_reports: Dict[str, InstrumentationReport] = {}
+
+
+def get_report(path: str) -> InstrumentationReport:
+    if path not in _reports:
+        _reports[path] = InstrumentationReport(path)
+    return _reports[path]
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Any, Dict, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from wake.testing import *
 
@@ -14,12 +13,40 @@ from .utils import (
     decorate_all_functions,
 )
 
-
 Events = List[Any]
+# (kind, key, previous value); keys are address ids or packed pairs of them
+JournalEntry = Tuple[str, int, Optional[uint]]
+
+# an allowance is keyed by owner_id << _ID_BITS | spender_id
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def _pack(owner_id: int, spender_id: int) -> int:
+    return owner_id << _ID_BITS | spender_id
 
 
 @decorate_all_functions(account_to_address_converter)
 class ERC20Mock:
+    """Addresses are interned to consecutive integer ids on their first write,
+    balances are a list indexed by the id and allowances a flat dict keyed by
+    the packed pair of ids, so the per-account memory stays small."""
+
+    __slots__ = (
+        "total_supply",
+        "balances_sum",
+        "static_max_allowance",
+        "dirty_balances",
+        "dirty_allowances",
+        "_ids",
+        "_addresses",
+        "_balances",
+        "_allowances",
+        "_journal",
+        "_journaled",
+        "_snapshots",
+    )
+
     def __init__(
         self,
         initial_supply: uint = 0,
@@ -30,14 +57,30 @@ class ERC20Mock:
         static_max_allowance: bool = True,
     ) -> None:
         self.total_supply = initial_supply
-        self.balances: Balances = defaultdict(uint)
-        self.allowances: Allowances = defaultdict(lambda: defaultdict(uint))
+        # sum of all balances, kept up to date by every write
+        self.balances_sum = 0
         self.static_max_allowance = static_max_allowance
+        # keys written (or touched) since the last verification against the chain
+        self.dirty_balances: Set[Address] = set()
+        self.dirty_allowances: Set[Tuple[Address, Address]] = set()
+        self._ids: Dict[Address, int] = {}
+        self._addresses: List[Address] = []
+        self._balances: List[uint] = []
+        self._allowances: Dict[int, uint] = {}
+        # previous values of the writes since the oldest snapshot, only the first
+        # write of a key after each snapshot is needed to restore it
+        self._journal: List[JournalEntry] = []
+        # (kind, key) already in the journal since the latest snapshot
+        self._journaled: Set[Tuple[str, int]] = set()
+        # journal length at each snapshot, the index is the snapshot id
+        self._snapshots: List[int] = []
 
         # copy with convert Account -> Address
         for account, value in (initial_balances or {}).items():
             address = account.address if type(account) is Account else account
-            self.balances[address] = value
+            account_id = self._intern(address)
+            self.balances_sum += value - self._balances[account_id]
+            self._balances[account_id] = value
 
         for owner, allowances in (initial_allowances or {}).items():
             owner_address = owner.address if type(owner) is Account else owner
@@ -45,19 +88,112 @@ class ERC20Mock:
                 spender_address = (
                     spender.address if type(spender) is Account else spender
                 )
-                self.allowances[owner_address][spender_address] = value
+                key = _pack(self._intern(owner_address), self._intern(spender_address))
+                self._allowances[key] = value
 
-        assert self.total_supply >= sum(
-            self.balances.values()
+        assert (
+            self.total_supply >= self.balances_sum
         ), "The initial supply must not be less than the sum of the initial balances"
 
+    @property
+    def balances(self) -> Balances:
+        """Balances of all known addresses (a copy)."""
+        return dict(zip(self._addresses, self._balances))
+
+    @property
+    def allowances(self) -> Allowances:
+        """Allowances of all known pairs of addresses (a copy)."""
+        allowances: Allowances = {}
+        for key, value in self._allowances.items():
+            owner = self._addresses[key >> _ID_BITS]
+            allowances.setdefault(owner, {})[self._addresses[key & _ID_MASK]] = value
+        return allowances
+
     def balanceOf(self, account: Union[Account, Address]) -> uint:
-        return self.balances[account]
+        account_id = self._ids.get(account)
+        return 0 if account_id is None else self._balances[account_id]
 
     def allowance(
         self, owner: Union[Account, Address], spender: Union[Account, Address]
     ) -> uint:
-        return self.allowances[owner][spender]
+        owner_id = self._ids.get(owner)
+        spender_id = self._ids.get(spender)
+        if owner_id is None or spender_id is None:
+            return 0
+        return self._allowances.get(_pack(owner_id, spender_id), 0)
+
+    def snapshot(self) -> int:
+        """Start recording the writes so that the state can be reverted to this
+        point, e.g. together with `default_chain.snapshot()`."""
+        self._snapshots.append(len(self._journal))
+        self._journaled.clear()
+        return len(self._snapshots) - 1
+
+    def revert(self, snapshot_id: int) -> None:
+        """Undo the writes since the snapshot. Like chain snapshots, the snapshot
+        and all later ones are discarded. The restored keys are marked dirty."""
+        assert 0 <= snapshot_id < len(self._snapshots), "Invalid snapshot id"
+        position = self._snapshots[snapshot_id]
+        del self._snapshots[snapshot_id:]
+
+        while len(self._journal) > position:
+            kind, key, previous = self._journal.pop()
+            if kind == "total_supply":
+                self.total_supply = previous
+            elif kind == "balance":
+                self.balances_sum += previous - self._balances[key]
+                self._balances[key] = previous
+                self.dirty_balances.add(self._addresses[key])
+            else:
+                if previous is None:
+                    del self._allowances[key]
+                else:
+                    self._allowances[key] = previous
+                self.dirty_allowances.add(
+                    (self._addresses[key >> _ID_BITS], self._addresses[key & _ID_MASK])
+                )
+        position = self._snapshots[-1] if self._snapshots else len(self._journal)
+        self._journaled = {(kind, key) for kind, key, _ in self._journal[position:]}
+
+    def _intern(self, address: Address) -> int:
+        address_id = self._ids.get(address)
+        if address_id is None:
+            address_id = self._ids[address] = len(self._addresses)
+            self._addresses.append(address)
+            self._balances.append(0)
+        return address_id
+
+    def _record(self, kind: str, key: int, previous: Optional[uint]) -> None:
+        if self._snapshots and (kind, key) not in self._journaled:
+            self._journaled.add((kind, key))
+            self._journal.append((kind, key, previous))
+
+    def _set_total_supply(self, value: uint) -> None:
+        self._record("total_supply", 0, self.total_supply)
+        self.total_supply = value
+
+    def _set_balance(self, account: Address, value: uint) -> None:
+        account_id = self._intern(account)
+        self._record("balance", account_id, self._balances[account_id])
+        self.balances_sum += value - self._balances[account_id]
+        self._balances[account_id] = value
+        self.dirty_balances.add(account)
+
+    def _set_allowance(self, owner: Address, spender: Address, value: uint) -> None:
+        key = _pack(self._intern(owner), self._intern(spender))
+        self._record("allowance", key, self._allowances.get(key))
+        self._allowances[key] = value
+        self.dirty_allowances.add((owner, spender))
+
+    def touch(
+        self,
+        balances: Iterable[Address] = (),
+        allowances: Iterable[Tuple[Address, Address]] = (),
+    ) -> None:
+        """Mark keys as dirty without changing them, e.g. when an operation failed
+        but the token could have changed the keys anyway."""
+        self.dirty_balances.update(balances)
+        self.dirty_allowances.update(allowances)
 
     def mint(
         self,
@@ -68,8 +204,8 @@ class ERC20Mock:
     ) -> Events:
         assert allow_zero_account or to != Address.ZERO
 
-        self.balances[to] += amount
-        self.total_supply += amount
+        self._set_balance(to, self._balanceOf(to) + amount)
+        self._set_total_supply(self.total_supply + amount)
         return [IERC20.Transfer(Address.ZERO, to, amount)]
 
     def burn(
@@ -80,10 +216,10 @@ class ERC20Mock:
         allow_zero_account: bool = False,
     ) -> Events:
         assert allow_zero_account or from_ != Address.ZERO
-        assert self.balances[from_] >= amount
+        assert self._balanceOf(from_) >= amount
 
-        self.balances[from_] -= amount
-        self.total_supply -= amount
+        self._set_balance(from_, self._balanceOf(from_) - amount)
+        self._set_total_supply(self.total_supply - amount)
         return [IERC20.Transfer(from_, Address.ZERO, amount)]
 
     def approve(
@@ -100,7 +236,7 @@ class ERC20Mock:
         assert allow_zero_account or spender != Address.ZERO
 
         if not dry_run:
-            self.allowances[owner][spender] = amount
+            self._set_allowance(owner, spender, amount)
         return [IERC20.Approval(owner, spender, amount)]
 
     def transfer(
@@ -115,11 +251,11 @@ class ERC20Mock:
         # we cannot transfer from 0x0 (however, 0 value MAY allow it)
         assert amount == 0 or owner != Address.ZERO
         assert allow_zero_account or receiver != Address.ZERO
-        assert self.balances[owner] >= amount
+        assert self._balanceOf(owner) >= amount
 
         if not dry_run:
-            self.balances[owner] -= amount
-            self.balances[receiver] += amount
+            self._set_balance(owner, self._balanceOf(owner) - amount)
+            self._set_balance(receiver, self._balanceOf(receiver) + amount)
         return [IERC20.Transfer(owner, receiver, amount)]
 
     def transferFrom(
@@ -134,10 +270,10 @@ class ERC20Mock:
     ) -> Events:
         # 0x0 cannot perform any operation
         assert spender != Address.ZERO
-        assert self.allowances[owner][spender] >= amount
+        assert self._allowance(owner, spender) >= amount
         # transfer() also checks other parameters
 
-        self.transfer(
+        self._transfer(
             owner,
             receiver,
             amount,
@@ -145,11 +281,12 @@ class ERC20Mock:
             dry_run=dry_run,
         )
         if not dry_run:
-            if (
-                self.allowances[owner][spender] != UINT256_MAX
-                or not self.static_max_allowance
-            ):
-                self.allowances[owner][spender] -= amount
+            allowance = self._allowance(owner, spender)
+            if allowance != UINT256_MAX or not self.static_max_allowance:
+                self._set_allowance(owner, spender, allowance - amount)
+            else:
+                # dirty even if unchanged, the token may still decrease it
+                self.dirty_allowances.add((owner, spender))
         return [IERC20.Transfer(owner, receiver, amount)]
 
     def should_transfer_succeed(
@@ -161,7 +298,7 @@ class ERC20Mock:
         allow_zero_account: bool = False,
     ) -> bool:
         try:
-            self.transfer(
+            self._transfer(
                 owner,
                 receiver,
                 amount,
@@ -182,7 +319,7 @@ class ERC20Mock:
         allow_zero_account: bool = False,
     ) -> bool:
         try:
-            self.approve(
+            self._approve(
                 owner=owner,
                 spender=spender,
                 amount=amount,
@@ -204,7 +341,7 @@ class ERC20Mock:
         allow_zero_account: bool = False,
     ) -> bool:
         try:
-            self.transferFrom(
+            self._transferFrom(
                 owner,
                 spender,
                 receiver,
@@ -216,3 +353,10 @@ class ERC20Mock:
             return False
         else:
             return True
+
+    # undecorated aliases for internal calls with already converted arguments
+    _balanceOf = balanceOf
+    _allowance = allowance
+    _approve = approve
+    _transfer = transfer
+    _transferFrom = transferFrom
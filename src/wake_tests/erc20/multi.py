@@ -0,0 +1,99 @@
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from wake.testing import *
+
+from .IERC20 import IERC20
+from .corpus import Step
+from .diagnostics import Diagnostics
+from .fuzz import ERC20FuzzTest
+from .state import create_state_reader
+from .utils import DivergentBehaviorWarning
+
+
+class ERC20MultiFuzzTest(ERC20FuzzTest):
+    def __init__(self, tokens: Sequence[Account], **kwargs: Any) -> None:
+        """`ERC20FuzzTest` of several tokens deployed on the same chain. Every step
+        is executed on all tokens, each verified against a mock of its own, so the
+        outcomes, events and return values of the tokens must agree with each other
+        as far as the mock requires.
+
+        Where the standard leaves room (e.g. returning false instead of reverting or
+        transfers to the zero address), the warnings of the tokens are compared
+        after every step (after every batch with `batch_size` > 1). A difference is
+        recorded as `DivergentBehaviorWarning` into `self.diagnostics`.
+
+        The arguments of the flows are generated from the mock of the first token
+        and `coverage_guided` traces the first token only. The other keyword
+        arguments are those of `ERC20FuzzTest` and apply to all tokens."""
+        assert len(tokens) > 0, "No tokens to test"
+        super().__init__(tokens[0], **kwargs)
+        self.tokens = list(tokens)
+        self.diagnostics = Diagnostics()
+        self._names = [str(token) for token in self.tokens]
+        self._counts = []
+
+    def _setup(self) -> None:
+        super()._setup()
+        for token in self.tokens[1:]:
+            state_reader = create_state_reader(
+                token, self.storage_reads, use_dump=self.storage_dump
+            )
+            wrapper = self._create_wrapper(IERC20(token.address), state_reader)
+            self.test_wrappers.append(wrapper)
+
+    @contextmanager
+    def _campaign(self, track_coverage: bool = True):
+        with super()._campaign(track_coverage):
+            try:
+                yield
+            finally:
+                self.diagnostics.emit()
+
+    def _replay_failure(self, steps: Iterable[Step]) -> Optional[Exception]:
+        try:
+            return super()._replay_failure(steps)
+        finally:
+            self.diagnostics.clear()
+
+    def pre_sequence(self) -> None:
+        self._counts = [Counter(w.diagnostics.counts) for w in self.test_wrappers]
+        return super().pre_sequence()
+
+    def _execute(self, step: Step) -> None:
+        if self._queued() > 0 and not self._is_queued(step):
+            # the assert_* methods would flush the batch themselves, bypassing
+            # `_flush`, and its warnings would be compared as those of this step
+            self._flush()
+        super()._execute(step)
+        if self._queued() == 0:
+            args = {key: value for key, value in step.items() if key != "operation"}
+            self._cross_check(args)
+
+    def _flush(self) -> None:
+        queued = self._queued()
+        super()._flush()
+        if queued > 0:
+            self._cross_check({})
+
+    def _cross_check(self, args: Dict[str, Any]) -> None:
+        """Compare the warnings recorded by each token since the last check."""
+        counts = [Counter(w.diagnostics.counts) for w in self.test_wrappers]
+        deltas = [new - old for new, old in zip(counts, self._counts)]
+        self._counts = counts
+        for key in set().union(*deltas):
+            occurrences = [delta[key] for delta in deltas]
+            if len(set(occurrences)) == 1:
+                continue
+            category, operation, outcome = key
+            most = max(occurrences)
+            names = ", ".join(
+                name for name, count in zip(self._names, occurrences) if count == most
+            )
+            self.diagnostics.record(
+                DivergentBehaviorWarning,
+                operation,
+                f"{outcome} ({category.__name__}) only on {names}",
+                **args,
+            )
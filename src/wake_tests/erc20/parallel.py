@@ -0,0 +1,173 @@
+import multiprocessing
+import os
+import random
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from wake.testing import *
+from wake.testing.fuzzing import *
+
+from .fuzz import ERC20FuzzTest
+
+
+@dataclass
+class SequenceFailure:
+    sequence: int
+    seed: int
+    # index of the flow that failed (or the last executed one)
+    flow: int
+    error: str
+
+
+@dataclass
+class FuzzReport:
+    """Aggregated result of `run_fuzz_parallel`."""
+
+    seed: int
+    sequences: int
+    workers: int
+    flows: Counter = field(default_factory=Counter)
+    failures: List[SequenceFailure] = field(default_factory=list)
+    duration: float = 0.0
+
+    def __str__(self) -> str:
+        lines = [
+            f"{self.sequences} sequences in {self.workers} workers, "
+            f"base seed {self.seed}, {self.duration:.1f} s",
+        ]
+        for name, count in sorted(self.flows.items()):
+            lines.append(f"  {name}: {count}")
+        lines.append(f"{len(self.failures)} failed sequences")
+        for failure in self.failures:
+            lines.append(
+                f"sequence {failure.sequence} (seed {failure.seed}) failed "
+                f"in flow {failure.flow}:\n{failure.error}"
+            )
+        return "\n".join(lines)
+
+    def assert_no_failures(self) -> None:
+        assert len(self.failures) == 0, str(self)
+
+
+def run_fuzz_parallel(
+    deploy: Callable[[], Account],
+    sequences_count: int,
+    flows_count: int,
+    *,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    fuzz_class: type = ERC20FuzzTest,
+    fuzz_kwargs: Optional[Dict[str, Any]] = None,
+    chain_kwargs: Optional[Dict[str, Any]] = None,
+    chain_uris: Optional[List[str]] = None,
+) -> FuzzReport:
+    """Run the fuzz test in `workers` processes (all CPUs by default), each
+    connected to its own chain.
+
+    `deploy` is called in every worker after connecting the chain and must
+    return the token; `fuzz_class(token, **fuzz_kwargs)` is then run there.
+    `deploy`, `fuzz_class` and the arguments are sent to the workers, so they
+    must be picklable, i.e. `deploy` must be a module-level function.
+
+    Sequence `i` is seeded with `seed + i` and worker `k` runs the sequences
+    `k, k + workers, ...`, so a failed sequence can be reproduced alone with
+    its seed regardless of the number of workers. With `coverage_guided`, the
+    coverage is therefore collected per sequence only. Must not be called with
+    `default_chain` connected in the current process.
+
+    Workers launch the backend from wake.toml unless `chain_uris` of already
+    running nodes are given; worker `k` then uses `chain_uris[k]` and there is one
+    worker per URI by default. Workers sharing a node would revert each other's
+    snapshots, so `ValueError` is raised if there are fewer URIs than workers."""
+    if workers is None:
+        workers = len(chain_uris) if chain_uris else os.cpu_count() or 1
+    workers = max(1, min(workers, sequences_count))
+    if chain_uris and len(chain_uris) < workers:
+        raise ValueError(
+            f"{len(chain_uris)} chain_uris for {workers} workers, "
+            "every worker needs its own node"
+        )
+    if seed is None:
+        seed = random.getrandbits(32)
+
+    report = FuzzReport(seed=seed, sequences=sequences_count, workers=workers)
+    start = time.perf_counter()
+    # chain connections must not be inherited by the workers
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = []
+        for k in range(workers):
+            worker_chain_kwargs = dict(chain_kwargs or {})
+            if chain_uris:
+                worker_chain_kwargs["uri"] = chain_uris[k]
+            futures.append(
+                executor.submit(
+                    _run_worker,
+                    deploy,
+                    list(range(k, sequences_count, workers)),
+                    flows_count,
+                    seed,
+                    fuzz_class,
+                    fuzz_kwargs or {},
+                    worker_chain_kwargs,
+                )
+            )
+        for future in futures:
+            flows, failures = future.result()
+            report.flows.update(flows)
+            report.failures.extend(failures)
+    report.failures.sort(key=lambda failure: failure.sequence)
+    report.duration = time.perf_counter() - start
+    return report
+
+
+def run_fuzz_sequence(
+    test: FuzzTest, sequence: int, flows_count: int, seed: int
+) -> Optional[SequenceFailure]:
+    """Run a single sequence seeded with `seed + sequence` on the connected chain
+    and revert the chain afterwards, even if the sequence fails. The coverage
+    collected by the previous sequences is reset (see `reset_coverage`)."""
+    random.seed(seed + sequence)
+    if isinstance(test, ERC20FuzzTest):
+        test.reset_coverage()
+    snapshot = default_chain.snapshot()
+    try:
+        test.run(1, flows_count)
+    except Exception:
+        return SequenceFailure(
+            sequence=sequence,
+            seed=seed + sequence,
+            flow=getattr(test, "_flow_num", 0),
+            error=traceback.format_exc(),
+        )
+    finally:
+        default_chain.revert(snapshot)
+    return None
+
+
+def _run_worker(
+    deploy: Callable[[], Account],
+    sequences: List[int],
+    flows_count: int,
+    seed: int,
+    fuzz_class: type,
+    fuzz_kwargs: Dict[str, Any],
+    chain_kwargs: Dict[str, Any],
+):
+    failures = []
+    with default_chain.connect(**chain_kwargs), ExitStack() as stack:
+        if chain_kwargs.get("uri") is not None:
+            # leave the already running node as it was
+            stack.enter_context(default_chain.snapshot_and_revert())
+        test = fuzz_class(deploy(), **fuzz_kwargs)
+        for sequence in sequences:
+            failure = run_fuzz_sequence(test, sequence, flows_count, seed)
+            if failure is not None:
+                failures.append(failure)
+        flows = Counter(getattr(test, "flows_counter", {}))
+    return flows, failures
@@ -0,0 +1,61 @@
+from typing import List, Sequence, Tuple, Union
+
+from wake.testing import *
+
+
+# Runtime code placed at the sender by a state override. It executes the calls
+# encoded in its calldata one after another, each record being
+#   target (32 bytes) | calldata length (32 bytes) | calldata (padded to 32 bytes)
+# and returns for each call
+#   success (32 bytes) | return data size (32 bytes) | first word of return data
+# A reverted call only discards its own changes, so the later calls see the
+# state left by the previous ones.
+PROBE_CODE = bytes.fromhex(
+    "600060005b3681101561005057806020013580826040018460600137600083604001"
+    "526020836040018285606001600086355af183523d8360200152601f01601f191601"
+    "6040019060600190610004565b816000f3"
+)
+
+
+# "snapshot" sends a transaction and reverts the chain, "call" uses `probe_calls`
+PROBE_ENGINES = ("snapshot", "call")
+
+
+class ProbeError(Exception):
+    """The node does not support the state override required by the probe."""
+
+
+def probe_calls(
+    sender: Union[Account, Address],
+    calls: Sequence[Tuple[Union[Account, Address], bytes]],
+) -> List[Tuple[bool, bytes]]:
+    """Execute the calls (target, calldata) in sequence from `sender` in a single
+    `eth_call`, without any changes to the chain state, and return the success
+    flag and up to 32 bytes of the return data of each call.
+
+    The code of `sender` is replaced for the duration of the call; tokens calling
+    back to the sender may behave differently than with a real transaction."""
+    sender = sender.address if isinstance(sender, Account) else sender
+    data = bytearray()
+    for target, calldata in calls:
+        target = target.address if isinstance(target, Account) else target
+        data += bytes(target).rjust(32, b"\x00")
+        data += len(calldata).to_bytes(32, "big")
+        data += calldata.ljust((len(calldata) + 31) // 32 * 32, b"\x00")
+
+    tx = {"from": str(sender), "to": str(sender), "data": "0x" + data.hex()}
+    override = {str(sender): {"code": "0x" + PROBE_CODE.hex()}}
+    result = default_chain.chain_interface._communicator.send_request(
+        "eth_call", [tx, "latest", override]
+    )
+    output = bytes.fromhex(result[2:])
+    if len(output) != 96 * len(calls):
+        # the state override was ignored and the call went to the sender as is
+        raise ProbeError(f"Unexpected probe output of {len(output)} bytes")
+
+    results = []
+    for i in range(0, len(output), 96):
+        success = int.from_bytes(output[i : i + 32], "big") == 1
+        size = min(int.from_bytes(output[i + 32 : i + 64], "big"), 32)
+        results.append((success, output[i + 64 : i + 64 + size]))
+    return results
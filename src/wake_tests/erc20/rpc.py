@@ -0,0 +1,69 @@
+import json
+from typing import Any, List, Sequence, Tuple, Union
+
+from wake.development.json_rpc import JsonRpcError
+from wake.testing import *
+
+from .IERC20 import IERC20
+
+
+def batch_request(requests: Sequence[Tuple[str, List]]) -> List[Any]:
+    """Send JSON-RPC requests (method, params) to `default_chain` in a single batch,
+    i.e. in one round-trip, and return their results in the same order."""
+    if len(requests) == 0:
+        return []
+
+    communicator = default_chain.chain_interface._communicator
+    first_id = communicator._request_id
+    communicator._request_id += len(requests)
+    batch = [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": first_id + i}
+        for i, (method, params) in enumerate(requests)
+    ]
+    responses = communicator._protocol.send_recv(json.dumps(batch))
+    if not isinstance(responses, list):
+        # the whole batch was rejected
+        raise JsonRpcError(responses.get("error", responses))
+
+    # the responses may come in any order
+    results: List[Any] = [None] * len(requests)
+    for response in responses:
+        if "error" in response:
+            raise JsonRpcError(response["error"])
+        results[response["id"] - first_id] = response["result"]
+    return results
+
+
+def batch_call(calls: Sequence[Tuple[Union[Account, Address], bytes]]) -> List[bytes]:
+    """Execute `eth_call`s (target, calldata) in a single batch and return the raw return data."""
+    requests = []
+    for to, data in calls:
+        to = to.address if isinstance(to, Account) else to
+        requests.append(
+            ("eth_call", [{"to": str(to), "data": "0x" + data.hex()}, "latest"])
+        )
+    return [bytes.fromhex(result[2:]) for result in batch_request(requests)]
+
+
+def read_balances(
+    erc20: IERC20, accounts: Sequence[Union[Account, Address]]
+) -> List[uint]:
+    """Read `balanceOf` of all the accounts in one round-trip."""
+    results = batch_call(
+        [(erc20, Abi.encode_call(IERC20.balanceOf, [account])) for account in accounts]
+    )
+    return [Abi.decode(["uint256"], result)[0] for result in results]
+
+
+def read_allowances(
+    erc20: IERC20,
+    pairs: Sequence[Tuple[Union[Account, Address], Union[Account, Address]]],
+) -> List[uint]:
+    """Read `allowance` of all the (owner, spender) pairs in one round-trip."""
+    results = batch_call(
+        [
+            (erc20, Abi.encode_call(IERC20.allowance, [owner, spender]))
+            for owner, spender in pairs
+        ]
+    )
+    return [Abi.decode(["uint256"], result)[0] for result in results]
@@ -0,0 +1,117 @@
+from typing import Callable, List
+
+from .corpus import Step
+
+
+_ADDRESS_KEYS = ("owner", "spender", "receiver")
+
+
+class _Budget:
+    def __init__(self, fails: Callable[[List[Step]], bool], max_attempts: int):
+        self.fails = fails
+        self.attempts = max_attempts
+
+    def __call__(self, steps: List[Step]) -> bool:
+        if self.attempts <= 0:
+            return False
+        self.attempts -= 1
+        return self.fails(steps)
+
+
+def shrink_sequence(
+    steps: List[Step],
+    fails: Callable[[List[Step]], bool],
+    account_count: int,
+    max_attempts: int = 5000,
+) -> List[Step]:
+    """Return a smaller sequence for which `fails` is still true: steps are removed
+    by delta debugging, then amounts and addresses are minimized, until nothing
+    changes or `max_attempts` calls of `fails` are used up.
+
+    Addresses are replaced by accounts with lower indices (`account_count` is the
+    number of `default_chain.accounts`), amounts are binary searched towards 0."""
+    fails = _Budget(fails, max_attempts)
+    while True:
+        shrunk = _remove_steps(steps, fails)
+        shrunk = _minimize_amounts(shrunk, fails)
+        shrunk = _minimize_addresses(shrunk, fails, account_count)
+        if shrunk == steps or fails.attempts <= 0:
+            return shrunk
+        steps = shrunk
+
+
+def _remove_steps(steps: List[Step], fails) -> List[Step]:
+    # ddmin, testing the complements of n chunks
+    n = 2
+    while len(steps) >= 2:
+        chunk = len(steps) // n
+        for i in range(n):
+            start = i * chunk
+            end = len(steps) if i == n - 1 else start + chunk
+            complement = steps[:start] + steps[end:]
+            if fails(complement):
+                steps = complement
+                n = max(n - 1, 2)
+                break
+        else:
+            if n >= len(steps):
+                break
+            n = min(n * 2, len(steps))
+    if len(steps) == 1 and fails([]):
+        return []
+    return steps
+
+
+def _minimize_amounts(steps: List[Step], fails) -> List[Step]:
+    for i in range(len(steps)):
+        lo, hi = 0, steps[i]["amount"]
+        # the smallest failing amount found so far is hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = _replace(steps, i, "amount", mid)
+            if fails(candidate):
+                hi = mid
+                steps = candidate
+            else:
+                lo = mid + 1
+    return steps
+
+
+def _minimize_addresses(steps: List[Step], fails, account_count: int) -> List[Step]:
+    # the same address usually has to stay the same in all steps
+    used = {step[key] for step in steps for key in _ADDRESS_KEYS if key in step}
+    for current in sorted(used, key=lambda value: (isinstance(value, str), value)):
+        limit = current if isinstance(current, int) else account_count
+        for index in range(limit):
+            if index in used:
+                continue
+            candidate = [
+                {
+                    key: index if key in _ADDRESS_KEYS and value == current else value
+                    for key, value in step.items()
+                }
+                for step in steps
+            ]
+            if fails(candidate):
+                steps = candidate
+                used = (used - {current}) | {index}
+                break
+
+    for i in range(len(steps)):
+        for key in _ADDRESS_KEYS:
+            current = steps[i].get(key)
+            if current is None:
+                continue
+            limit = current if isinstance(current, int) else account_count
+            for index in range(limit):
+                candidate = _replace(steps, i, key, index)
+                if fails(candidate):
+                    steps = candidate
+                    break
+    return steps
+
+
+def _replace(steps: List[Step], i: int, key: str, value) -> List[Step]:
+    step = dict(steps[i])
+    step[key] = value
+    return steps[:i] + [step] + steps[i + 1 :]
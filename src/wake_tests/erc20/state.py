@@ -0,0 +1,149 @@
+import gzip
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from wake.testing import *
+
+from .IERC20 import IERC20
+from .rpc import batch_request, read_allowances, read_balances
+
+
+BALANCES_LABELS = ("_balances", "balances", "_balanceOf", "balanceOf")
+ALLOWANCES_LABELS = ("_allowances", "allowances", "_allowance", "allowance")
+
+BALANCES_TYPE = "t_mapping(t_address,t_uint256)"
+ALLOWANCES_TYPE = "t_mapping(t_address,t_mapping(t_address,t_uint256))"
+
+
+class AbiStateReader:
+    """Reads balances and allowances with `balanceOf` and `allowance` eth_calls."""
+
+    def __init__(self, erc20: IERC20) -> None:
+        self.erc20 = erc20
+
+    def balances(self, accounts: Sequence[Address]) -> List[uint]:
+        return read_balances(self.erc20, accounts)
+
+    def allowances(self, pairs: Sequence[Tuple[Address, Address]]) -> List[uint]:
+        return read_allowances(self.erc20, pairs)
+
+
+class StorageStateReader:
+    """Reads balances and allowances directly from the storage slots of the
+    `balances` and `allowances` mappings, without executing the token code.
+
+    With `use_dump`, the whole storage of the token is pulled in one
+    `anvil_dumpState` call instead of reading the individual slots."""
+
+    def __init__(
+        self,
+        token: Union[Account, Address],
+        balances_slot: int,
+        allowances_slot: int,
+        use_dump: bool = False,
+    ) -> None:
+        self.address = token.address if isinstance(token, Account) else token
+        self.balances_slot = balances_slot
+        self.allowances_slot = allowances_slot
+        self.use_dump = use_dump
+
+    @classmethod
+    def from_storage_layout(
+        cls,
+        token: Union[Account, Address],
+        storage_layout: Dict[str, Any],
+        use_dump: bool = False,
+    ) -> Optional["StorageStateReader"]:
+        """Find the mappings in the solc storage layout, return None if unknown."""
+        balances_slot = _find_mapping_slot(
+            storage_layout, BALANCES_TYPE, BALANCES_LABELS
+        )
+        allowances_slot = _find_mapping_slot(
+            storage_layout, ALLOWANCES_TYPE, ALLOWANCES_LABELS
+        )
+        if balances_slot is None or allowances_slot is None:
+            return None
+        return cls(token, balances_slot, allowances_slot, use_dump=use_dump)
+
+    def balances(self, accounts: Sequence[Address]) -> List[uint]:
+        return self._read(
+            [_mapping_slot(self.balances_slot, account) for account in accounts]
+        )
+
+    def allowances(self, pairs: Sequence[Tuple[Address, Address]]) -> List[uint]:
+        return self._read(
+            [
+                _mapping_slot(_mapping_slot(self.allowances_slot, owner), spender)
+                for owner, spender in pairs
+            ]
+        )
+
+    def dump_storage(self) -> Dict[int, int]:
+        """Return all non-zero storage slots of the token."""
+        state = default_chain.chain_interface._communicator.send_request(
+            "anvil_dumpState"
+        )
+        data = bytes.fromhex(state[2:])
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        accounts = json.loads(data)
+        accounts = accounts.get("accounts", accounts)
+        address = str(self.address).lower()
+        for key, account in accounts.items():
+            if key.lower() == address:
+                return {
+                    int(slot, 16): int(value, 16)
+                    for slot, value in account.get("storage", {}).items()
+                }
+        return {}
+
+    def _read(self, slots: List[int]) -> List[uint]:
+        if len(slots) == 0:
+            return []
+        if self.use_dump:
+            storage = self.dump_storage()
+            return [storage.get(slot, 0) for slot in slots]
+
+        address = str(self.address)
+        results = batch_request(
+            [("eth_getStorageAt", [address, hex(slot), "latest"]) for slot in slots]
+        )
+        return [int(result, 16) for result in results]
+
+
+StateReader = Union[AbiStateReader, StorageStateReader]
+
+
+def create_state_reader(
+    token: Account, storage_reads: bool = False, use_dump: bool = False
+) -> StateReader:
+    """Return the storage reader if requested and the storage layout of the token
+    (a pytypes instance) is known, otherwise the ABI reader."""
+    storage_layout = getattr(token, "_storage_layout", None)
+    if storage_reads and storage_layout is not None:
+        reader = StorageStateReader.from_storage_layout(
+            token, storage_layout, use_dump=use_dump
+        )
+        if reader is not None:
+            return reader
+    return AbiStateReader(IERC20(token.address))
+
+
+def _find_mapping_slot(
+    storage_layout: Dict[str, Any], type_name: str, labels: Sequence[str]
+) -> Optional[int]:
+    # mappings with other names may hold something else than balances (e.g. shares)
+    candidates = [
+        item for item in storage_layout.get("storage", []) if item["type"] == type_name
+    ]
+    for label in labels:
+        for item in candidates:
+            if item["label"] == label:
+                return int(item["slot"])
+    return None
+
+
+def _mapping_slot(slot: int, key: Address) -> int:
+    return int.from_bytes(
+        keccak256(bytes(key).rjust(32, b"\x00") + slot.to_bytes(32, "big")), "big"
+    )
@@ -1,36 +1,280 @@
 import abc
 from collections import defaultdict
-from typing import Dict, Union
+from contextlib import ExitStack, contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Dict, Hashable, Optional, Type, Union
+
+import pytest
 
 from wake.testing import *
 
 from .IERC20 import IERC20
+from .instrumentation import Instrumentation, get_report
 from .mock import ERC20Mock
-from .utils import Allowances
+from .rpc import read_allowances
+from .state import create_state_reader
+from .utils import Allowances, Balances, keccak256_hash
 from .differential import ERC20DifferentialTest
 
 
+CHAIN_SCOPES = ("function", "class", "session")
+
+# chain connection shared by consecutive test classes with chain_scope = "session"
+_session_chain: Optional[ExitStack] = None
+
+
+@dataclass
+class DeploymentTemplate:
+    """Chain snapshot taken right after the token deployment together with
+    the initial state of the mock, so that the next tests can restore both
+    instead of redeploying the token and reading the allowances again."""
+
+    key: Hashable
+    token: Account
+    initial_balances: Balances
+    initial_allowances: Allowances
+    snapshot: str
+
+
+# templates of the shared chain scopes keyed by `ERC20Base._template_key`, in the
+# order of their snapshots; the last one is the state the chain was reverted to
+_templates: Dict[Hashable, DeploymentTemplate] = {}
+
+
+def _close_session_chain() -> None:
+    global _session_chain
+    if _session_chain is not None:
+        _session_chain.close()
+        _session_chain = None
+    # the snapshots are gone with the chain
+    _templates.clear()
+
+
+def _session_chain_needed(request) -> bool:
+    """Whether the next collected test needing a chain belongs to a class with
+    the "session" scope. Other tests connect the chain themselves and wake does
+    not allow connecting an already connected chain."""
+    items = request.session.items
+    indices = [
+        i for i, item in enumerate(items) if getattr(item, "cls", None) is request.cls
+    ]
+    for item in items[indices[-1] + 1 :] if indices else []:
+        cls = getattr(item, "cls", None)
+        if cls is None or not issubclass(cls, ERC20Base):
+            return False
+        if not cls.abi_only:
+            return cls.chain_scope == "session"
+    return False
+
+
+def connect_chain(fn):
+    """Run the test on a chain selected by `ERC20Base.chain_scope`.
+
+    With the "function" scope, a new chain is connected for the test. Otherwise, the
+    already connected chain is used and reverted to the deployment template when
+    the test finishes."""
+
+    @wraps(fn)
+    def wrapper(self: "ERC20Base", *args, **kwargs):
+        if self.abi_only:
+            pytest.skip("The test requires a chain, abi_only is set.")
+        with _instrumented(self, fn.__name__), ExitStack() as stack:
+            # warnings recorded by the differential test are issued at the end
+            stack.callback(self._emit_diagnostics)
+            if self.chain_scope == "function":
+                with self._phase("connect"):
+                    stack.enter_context(self._connect())
+            else:
+                stack.callback(self._restore_template)
+            if self._instrumentation is not None:
+                stack.enter_context(self._instrumentation.track_gas())
+            return fn(self, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def _instrumented(base: Union["ERC20Base", Type["ERC20Base"]], test_name: str):
+    """Record requests and phases into `base._instrumentation` and add them to the
+    report if `instrumentation_report` is set."""
+    if base.instrumentation_report is None:
+        yield
+        return
+    instrumentation = Instrumentation()
+    base._instrumentation = instrumentation
+    try:
+        with instrumentation.record(), instrumentation.phase("total"):
+            yield
+    finally:
+        base._instrumentation = None
+        token = base.__name__ if isinstance(base, type) else type(base).__name__
+        get_report(base.instrumentation_report).add(token, test_name, instrumentation)
+
+
+def abi_test(fn):
+    """Run the test on the `ERC20Base.token_class` pytypes class as `self.token`
+    without connecting a chain. If the class is not set, connect the chain
+    (see `connect_chain`) and deploy the token first."""
+
+    @connect_chain
+    def with_deployment(self: "ERC20Base", *args, **kwargs):
+        self.setup_contract()
+        return fn(self, *args, **kwargs)
+
+    @wraps(fn)
+    def wrapper(self: "ERC20Base", *args, **kwargs):
+        if self.token_class is None:
+            return with_deployment(self, *args, **kwargs)
+        self.token = self.token_class
+        return fn(self, *args, **kwargs)
+
+    return wrapper
+
+
 class ERC20Base(abc.ABC):
     decimals: int = 18
     initial_supply: int = 0
     initial_balances: Dict[Union[Account, Address], uint] = {}
     static_max_allowance: bool = True
+    # "function" connects a new chain and deploys the token for every test,
+    # "class" and "session" share one chain per test class or per consecutive
+    # "session" test classes (it is disconnected before any other test), deploy
+    # the token once and revert to a snapshot after each test
+    chain_scope: str = "function"
+    # balances and allowances changed since the last check are always verified,
+    # every full_check_period-th check verifies all accounts (0 means never)
+    full_check_period: int = 1
+    # read balances and allowances for the checks directly from the storage
+    # if the mappings are found in the storage layout of the token
+    storage_reads: bool = False
+    # with storage_reads, pull the whole storage of the token in one
+    # anvil_dumpState call per check instead of reading the slots one by one
+    storage_dump: bool = False
+    # how the outcome of zero-address operations is found out before executing
+    # them: "snapshot" (transaction and revert) or "call" (single eth_call)
+    probe_engine: str = "snapshot"
+    # path of a JSON (.json) or CSV (.csv) report with request counts and phase
+    # timings of every test and of the whole class, None disables it
+    instrumentation_report: Optional[str] = None
+    # URI of an already running node (e.g. a long-lived anvil or any other
+    # JSON-RPC backend) used instead of launching the one from wake.toml; it
+    # saves only the node startup, calls still go over JSON-RPC (prefer IPC);
+    # the node is reverted to its initial state when disconnecting
+    chain_uri: Optional[str] = None
+    # keyword arguments of `default_chain.connect` (accounts, fork, hardfork, ...)
+    connect_kwargs: Dict[str, Any] = {}
+    # run only the ABI tests on token_class, never connect a chain
+    abi_only: bool = False
+    # pytypes class of the token (optional), ABI tests inspect it directly;
+    # with the "session" scope, test classes deploying the same creation code
+    # by the same deploy_token with the same initial supply and balances share
+    # the deployment
+    token_class: Optional[type] = None
+
+    _template: Optional[DeploymentTemplate] = None
+    _instrumentation: Optional[Instrumentation] = None
 
     @classmethod
     @abc.abstractmethod
     def deploy_token(cls) -> Account:
         ...
 
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def _chain_session(cls, request):
+        global _session_chain
+        assert cls.chain_scope in CHAIN_SCOPES, f"Invalid {cls.chain_scope=}"
+        assert (
+            not cls.abi_only or cls.token_class is not None
+        ), "abi_only requires token_class"
+
+        if cls.chain_scope == "function" or cls.abi_only:
+            yield
+        elif cls.chain_scope == "class":
+            with ExitStack() as stack:
+                with _instrumented(cls, "connect"):
+                    stack.enter_context(cls._connect())
+                yield
+            # the snapshot does not outlive the class connection
+            _templates.pop(cls, None)
+        else:
+            if _session_chain is None:
+                _session_chain = ExitStack()
+                with _instrumented(cls, "connect"):
+                    _session_chain.enter_context(cls._connect())
+                request.config.add_cleanup(_close_session_chain)
+            # the deployment is kept for the next classes, see `_template_key`
+            yield
+            if not _session_chain_needed(request):
+                _close_session_chain()
+        if cls.instrumentation_report is not None:
+            report = get_report(cls.instrumentation_report)
+            report.add_total(cls.__name__)
+            report.write()
+
+    @classmethod
+    @contextmanager
+    def _connect(cls):
+        with default_chain.connect(cls.chain_uri, **cls.connect_kwargs):
+            if cls.chain_uri is None:
+                yield
+            else:
+                # do not leave the changes in a node shared with other runs
+                with default_chain.snapshot_and_revert():
+                    yield
+
+    @classmethod
+    def _template_key(cls) -> Hashable:
+        """The test class, or with the "session" scope and `token_class` set, the
+        creation code hash and `deploy_token` (which may pass other constructor
+        arguments or set the token up) with the initial supply and balances."""
+        if cls.chain_scope != "session" or cls.token_class is None:
+            return cls
+        return (
+            keccak256_hash(cls.token_class._creation_code),
+            cls.deploy_token.__func__,
+            cls.initial_supply,
+            frozenset(cls.initial_balances.items()),
+        )
+
     def setup_contract(self):
-        self.token = self.deploy_token()
-        self.erc20 = IERC20(self.token.address)
-        self.erc20_mock = ERC20Mock(
-            initial_supply=self.initial_supply,
-            initial_balances=self.initial_balances,
-            initial_allowances=self._init_allowances(),
-            static_max_allowance=self.static_max_allowance,
+        if self.chain_scope == "function":
+            with self._phase("deploy"):
+                self.token = self.deploy_token()
+            self.erc20 = IERC20(self.token.address)
+            initial_balances = self.initial_balances
+            with self._phase("mock_init"):
+                initial_allowances = self._init_allowances()
+        else:
+            template = _templates.get(self._template_key())
+            if template is None:
+                template = self._create_template()
+            elif template is not list(_templates.values())[-1]:
+                # deployed by another test class, the chain is elsewhere
+                self._revert_to(template)
+            self._template = template
+            self.token = template.token
+            self.erc20 = IERC20(self.token.address)
+            initial_balances = template.initial_balances
+            initial_allowances = template.initial_allowances
+        with self._phase("mock_init"):
+            self.erc20_mock = ERC20Mock(
+                initial_supply=self.initial_supply,
+                initial_balances=initial_balances,
+                initial_allowances=initial_allowances,
+                static_max_allowance=self.static_max_allowance,
+            )
+        self.differential = ERC20DifferentialTest(
+            self.erc20,
+            self.erc20_mock,
+            full_check_period=self.full_check_period,
+            state_reader=create_state_reader(
+                self.token, self.storage_reads, use_dump=self.storage_dump
+            ),
+            probe_engine=self.probe_engine,
+            instrumentation=self._instrumentation,
         )
-        self.differential = ERC20DifferentialTest(self.erc20, self.erc20_mock)
 
     def assert_total_supply_matches_expected(self) -> None:
         self.differential.assert_total_supply_matches_expected()
@@ -96,11 +340,53 @@ class ERC20Base(abc.ABC):
     def mint(self, to: Address, amount: uint) -> None:
         self.differential.mint(to, amount)
 
+    def _create_template(self) -> DeploymentTemplate:
+        with self._phase("deploy"):
+            token = self.deploy_token()
+        self.erc20 = IERC20(token.address)
+        with self._phase("mock_init"):
+            initial_allowances = self._init_allowances()
+        template = DeploymentTemplate(
+            key=self._template_key(),
+            token=token,
+            initial_balances=dict(self.initial_balances),
+            initial_allowances=initial_allowances,
+            snapshot=default_chain.snapshot(),
+        )
+        _templates[template.key] = template
+        return template
+
+    def _emit_diagnostics(self) -> None:
+        differential = getattr(self, "differential", None)
+        if differential is not None:
+            differential.diagnostics.emit()
+
+    def _phase(self, name: str):
+        if self._instrumentation is None:
+            return nullcontext()
+        return self._instrumentation.phase(name)
+
+    def _restore_template(self) -> None:
+        template = self._template
+        if template is not None:
+            self._revert_to(template)
+            self._template = None
+
+    @staticmethod
+    def _revert_to(template: DeploymentTemplate) -> None:
+        default_chain.revert(template.snapshot)
+        # reverting consumes the snapshot and all the later ones
+        keys = list(_templates)
+        for key in keys[keys.index(template.key) :]:
+            del _templates[key]
+        template.snapshot = default_chain.snapshot()
+        _templates[template.key] = template
+
     def _init_allowances(self) -> Allowances:
+        # the whole allowance matrix is read in a single JSON-RPC batch
+        accounts = [account.address for account in default_chain.accounts]
+        pairs = [(owner, spender) for owner in accounts for spender in accounts]
         allowances = defaultdict(lambda: defaultdict(uint))
-        for owner in default_chain.accounts:
-            for spender in default_chain.accounts:
-                allowances[owner.address][spender.address] = self.erc20.allowance(
-                    owner, spender
-                )
+        for (owner, spender), value in zip(pairs, read_allowances(self.erc20, pairs)):
+            allowances[owner][spender] = value
         return allowances
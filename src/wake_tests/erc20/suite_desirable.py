@@ -5,7 +5,7 @@ import pytest
 from wake.testing import *
 
 from .utils import UINT256_MAX
-from .suite_abc import ERC20Base
+from .suite_abc import ERC20Base, connect_chain
 
 
 class ERC20Desirable(ERC20Base):
@@ -18,7 +18,7 @@ class ERC20Desirable(ERC20Base):
     function.
     """
 
-    @default_chain.connect()
+    @connect_chain
     def test_address_zero_has_no_token(self):
         """The zero address SHOULD NOT have any token from the contract."""
         self.setup_contract()
@@ -26,7 +26,7 @@ class ERC20Desirable(ERC20Base):
             balance = self.erc20.balanceOf(Address.ZERO)
             assert balance == 0, "The zero address has a non-zero balance."
 
-    @default_chain.connect()
+    @connect_chain
     def test_balance_of_caller(self):
         """A `msg.sender` SHOULD be able to retrieve his/her own balance."""
         self.setup_contract()
@@ -34,7 +34,7 @@ class ERC20Desirable(ERC20Base):
         balance_self = self.erc20.balanceOf(account, from_=account)
         assert isinstance(balance_self, int), "Balance is not an integer."
 
-    @default_chain.connect()
+    @connect_chain
     def test_balance_of_non_caller(self):
         """A `msg.sender` SHOULD be able to retrieve balance of an address different from his/hers."""
         self.setup_contract()
@@ -43,7 +43,7 @@ class ERC20Desirable(ERC20Base):
         balance_other = self.erc20.balanceOf(another_account, from_=account)
         assert isinstance(balance_other, int), "Balance is not an integer."
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(
         reason="Approvals to the zero address may be allowed but it is not recommended."
     )
@@ -63,7 +63,7 @@ class ERC20Desirable(ERC20Base):
         )
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_fee_taking_transferFrom_present(self):
         """The `transferFrom` function DOES NOT take fees at test execution time."""
         self.setup_contract()
@@ -81,7 +81,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_allowances_match_expected()
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_fee_taking_transfer_present(self):
         """The `transfer` function DOES NOT take fees at test execution time."""
         self.setup_contract()
@@ -94,7 +94,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_multiple_transferFrom_exceed_allowance(self):
         """Multiple calls of `transferFrom` SHOULD NOT be allowed once allowance reach zero even if the tokenSender's balance is more than the allowance."""
         self.setup_contract()
@@ -127,7 +127,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_allowances_match_expected()
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_overwrite_approve_positive_to_zero(self):
         """Consecutive calls of `approve` function of positive-to-zero amounts CAN be called."""
         self.setup_contract()
@@ -139,7 +139,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_overwrite_approve_zero_to_positive(self):
         """Consecutive calls of `approve` function of zero-to-positive amounts CAN be called."""
         self.setup_contract()
@@ -151,7 +151,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_overwrite_approve_zero_to_zero(self):
         """Consecutive calls of `approve` function of zero-to-zero amounts CAN be called."""
         self.setup_contract()
@@ -163,7 +163,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_multiple_transfer(self):
         """Multiple `transfer` calls of positive amounts are ALLOWED given that the sum of the transferred amounts is less than or equal to the tokenSender's balance."""
         self.setup_contract()
@@ -179,7 +179,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_multiple_transferFrom(self):
         """Multiple `transferFrom` calls of positive amounts are ALLOWED given that the sum of the transferred amounts is less than or equal to the tokenSender's balance and approvals are given by the tokenSender."""
         self.setup_contract()
@@ -206,7 +206,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_self_approve(self):
         """Self-approval of positive amount is ALLOWED."""
         self.setup_contract()
@@ -216,7 +216,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_approve_valid(account_owner, account_owner, amount)
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_self_approve_transferFrom(self):
         """Self-approval and call of `transferFrom` from its own account of positive amount is ALLOWED."""
         self.setup_contract()
@@ -238,7 +238,7 @@ class ERC20Desirable(ERC20Base):
                 "The allowance of the tokenSender SHOULD be decreased by the amount of the transfer even if the tokenSender and the tokenReceiver are the same address."
             )
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_self_transfer(self):
         """Self `transfer` call of positive amount is ALLOWED and SHOULD NOT modify the balance."""
         self.setup_contract()
@@ -250,7 +250,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_total_transferFrom_to_other(self):
         """A tokenReceiver CAN call `transferFrom` of the tokenSender's total balance amount given that tokenSender has approved that."""
         self.setup_contract()
@@ -267,7 +267,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_total_transfer_to_other(self):
         """A `msg.sender` CAN call `transfer` of her total balance amount to a tokenReceiver."""
         self.setup_contract()
@@ -280,7 +280,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(
         reason="Transfers to the zero address may be allowed but it is not recommended."
     )
@@ -303,7 +303,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(
         reason="Transfers to the zero address may be allowed but it is not recommended."
     )
@@ -320,7 +320,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_total_supply_constant_after_transfer(self):
         """The contract's `totalSupply` variable SHOULD NOT be altered after `transfer` is called."""
         self.setup_contract()
@@ -333,7 +333,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_total_supply_matches_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_total_supply_constant_after_transferFrom(self):
         """The contract's `totalSupply` variable SHOULD NOT be altered after `transferFrom` is called."""
         self.setup_contract()
@@ -350,7 +350,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_total_supply_matches_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_transfer_does_not_update_others_balances(self):
         """A successful call of `transfer` DOES NOT update the balance of users who are neither the tokenSender nor the tokenReceiver."""
         self.setup_contract()
@@ -365,7 +365,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_transferFrom_decrease_allowance_as_expected(self):
         """A successful `transferFrom` of any positive amount MUST decrease the allowance of the tokenSender by the transferred amount."""
         self.setup_contract()
@@ -383,7 +383,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_transferFrom_does_not_update_others_balances(self):
         """A successful call of `transferFrom` DOES NOT update the balance of users who are neither the tokenSender nor the tokenReceiver."""
         self.setup_contract()
@@ -403,7 +403,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_address_cannot_approve_positive_amount(self):
         """A `approve` call of any positive amount SHOULD revert if the tokenSender is the zero address."""
         self.setup_contract()
@@ -421,7 +421,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_multiple_transfer(self):
         """Multiple calls of `transfer` of zero amount are ALLOWED."""
         self.setup_contract()
@@ -435,7 +435,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_multiple_transferFrom(self):
         """Multiple calls of `transferFrom` of zero amount are ALLOWED."""
         self.setup_contract()
@@ -461,7 +461,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_self_approve(self):
         """Self-approval of zero amount is ALLOWED."""
         self.setup_contract()
@@ -470,7 +470,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_approve_valid(account_owner, account_owner, 0)
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_self_approve_transferFrom(self):
         """Self-approval and call of `transferFrom` from its own account of zero amount is ALLOWED."""
         self.setup_contract()
@@ -484,7 +484,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_self_transfer(self):
         """Self `transfer` call of zero amount is ALLOWED and SHOULD NOT modify the balance."""
         self.setup_contract()
@@ -494,7 +494,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_total_transferFrom_to_other(self):
         """A tokenReceiver CAN call `transferFrom` of the tokenSender's total balance amount of zero."""
         self.setup_contract()
@@ -510,7 +510,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_total_transfer_to_other(self):
         """A `msg.sender` CAN call `transfer` of her total balance amount of zero to a tokenReceiver."""
         self.setup_contract()
@@ -521,7 +521,7 @@ class ERC20Desirable(ERC20Base):
 
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(
         reason="Transfer of zero amount to the zero address may be allowed but it is not recommended."
     )
@@ -539,7 +539,7 @@ class ERC20Desirable(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(
         reason="Transfer of zero amount to the zero address may be allowed but it is not recommended."
     )
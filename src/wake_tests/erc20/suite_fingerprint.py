@@ -3,7 +3,7 @@ import pytest
 from wake.testing import *
 
 from .utils import UINT256_MAX
-from .suite_abc import ERC20Base
+from .suite_abc import ERC20Base, connect_chain
 
 
 class ERC20Fingerprint(ERC20Base):
@@ -16,7 +16,7 @@ class ERC20Fingerprint(ERC20Base):
     decreased by `transferFrom` operations.
     """
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(reason="This is not a part of the standard.")
     def test_can_approve_more_than_balance(self):
         """The token ALLOWS tokenApprover to call `approve` of an amount higher than her balance."""
@@ -34,7 +34,7 @@ class ERC20Fingerprint(ERC20Base):
 
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(reason="This is not a part of the standard.")
     def test_infinite_approval_constant(self):
         """The token HAS infinite approval property. If the approval is set to type(uint256).max and a `transfer` is called, the allowance doesn't decrease."""
@@ -57,7 +57,7 @@ class ERC20Fingerprint(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(reason="This is not a part of the standard.")
     def test_infinite_approval_not_constant(self):
         """The token DOES NOT have infinite approval property. If the approval is set to type(uint256).max and a `transfer` is called, the allowance decreases."""
@@ -80,7 +80,7 @@ class ERC20Fingerprint(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(reason="This is not a part of the standard.")
     def test_maintains_approval_lower_than_balance(self):
         """TokenApprover MUST maintain at least the said amount in her balance before she can make a `transfer` call to another account."""
@@ -107,7 +107,7 @@ class ERC20Fingerprint(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(reason="This is not a part of the standard.")
     def test_overwrite_approve_positive_to_positive(self):
         """Consecutive calls of `approve` function of positive-to-positive amounts CAN be called."""
@@ -121,7 +121,7 @@ class ERC20Fingerprint(ERC20Base):
 
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(reason="This is not a part of the standard.")
     def test_reverts_if_approval_greater_than_balance(self):
         """The token REVERTS if a tokenApprover approves a tokenApprovee more than its balance."""
@@ -142,7 +142,7 @@ class ERC20Fingerprint(ERC20Base):
             approve_reverts
         ), "The token must revert if a tokenApprover approves more than its balance."
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(reason="This is not a part of the standard.")
     def test_reverts_on_infinite_approval(self):
         """The token REVERTS if one set the approval to type(uint256).max."""
@@ -161,7 +161,7 @@ class ERC20Fingerprint(ERC20Base):
             approve_reverts
         ), "The token must revert if one sets the approval to type(uint256).max."
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(reason="This is not a part of the standard.")
     def test_transferFrom_decrease_allowance_gt_expected(self):
         """A successful `transferFrom` call of a positive amount DECREASES the allowance of the tokenSender by MORE than the transferred amount."""
@@ -195,7 +195,7 @@ class ERC20Fingerprint(ERC20Base):
                 and allowance_after_erc20 < allowance_after_mock
             ), "The token must DECREASE the allowance by MORE than the transferred amount."
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(reason="This is not a part of the standard.")
     def test_transferFrom_decrease_allowance_lt_expected(self):
         """A successful `transferFrom` call of a positive amount DECREASES the allowance of the tokenSender by LESS than the transferred amount."""
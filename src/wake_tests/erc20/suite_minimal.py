@@ -1,12 +1,12 @@
 from wake.testing import *
 
-from .suite_abc import ERC20Base
+from .suite_abc import ERC20Base, connect_chain
 
 
 class ERC20Minimal(ERC20Base):
     """Tests of level **Minimal** check the properties that MUST be respected."""
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_approval_event_emission(self):
         """A successful `approve` call of positive amount MUST emit the `Approval` event correctly."""
         self.setup_contract()
@@ -18,7 +18,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_approve_valid(account_owner, account_spender, amount)
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_approve_allows_positive_transferFrom(self):
         """After a tokenApprover approves a tokenApprovee some positive amount via an `approve` call, any positive amount up to the said amount MUST be transferable by tokenApprovee via a `transferFrom` call, provided a sufficient balance of tokenApprover."""
         self.setup_contract()
@@ -52,7 +52,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_approve_allows_zero_transferFrom(self):
         """After a tokenApprover approves a tokenApprovee some positive amount via an `approve` call, zero amount MUST be transferable by tokenApprovee via a `transferFrom` call, provided a sufficient balance of tokenApprover."""
         self.setup_contract()
@@ -70,7 +70,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_approve_leads_to_allowance(self):
         """Positive approved amount MUST be reflected in the allowance correctly."""
         self.setup_contract()
@@ -81,7 +81,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_approve_valid(account_owner, account_spender, amount)
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_transfer_event_emission(self):
         """A successful `transfer` call of positive amount MUST emit the Transfer event correctly."""
         self.setup_contract()
@@ -96,7 +96,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_positive_transferFrom_event_emission(self):
         """A successful `transferFrom` call of positive amount MUST emit Transfer event correctly."""
         self.setup_contract()
@@ -117,7 +117,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_user_balance_initialized(self):
         """A successful `balanceOf(account)` call MUST return balance of `account` correctly after two dummy users' balances are initialized."""
         self.setup_contract()
@@ -136,7 +136,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_approval_event_emission(self):
         """A successful `approve` call of zero amount MUST emit the `Approval` event correctly."""
         self.setup_contract()
@@ -148,7 +148,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_approve_valid(account_owner, account_spender, amount)
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_approve_leads_to_allowance(self):
         """Zero approved amount MUST be reflected in the allowance correctly."""
         self.setup_contract()
@@ -160,7 +160,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_approve_valid(account_owner, account_spender, 0)
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transferFrom_by_other_emits_event(self):
         """A successful `transferFrom` of zero amount by any user other than the tokenSender MUST emit a Transfer event correctly."""
         self.setup_contract()
@@ -185,7 +185,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transferFrom_by_other_possible(self):
         """A successful `transferFrom` call of zero amount by any user other than the tokenSender MUST be possible."""
         self.setup_contract()
@@ -208,7 +208,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transferFrom_by_other_to_self_possible(self):
         """A successful `transferFrom` call of zero amount by any user other than the tokenSender to the tokenSender MUST be possible."""
         self.setup_contract()
@@ -230,7 +230,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transferFrom_by_self_emits_event(self):
         """A successful `transferFrom` call of zero amount by the tokenSender herself MUST emit a Transfer event correctly."""
         self.setup_contract()
@@ -252,7 +252,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transferFrom_by_self_possible(self):
         """A successful `transferFrom` call of zero amount by the tokenSender herself MUST be possible."""
         self.setup_contract()
@@ -274,7 +274,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transferFrom_by_self_to_self_possible(self):
         """A successful `transferFrom` call of zero amount by the tokenSender herself to herself MUST be possible."""
         self.setup_contract()
@@ -286,7 +286,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transfer_to_others_emits_event(self):
         """A successful `transfer` call of zero amount to another account MUST emit the Transfer event correctly."""
         self.setup_contract()
@@ -297,7 +297,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_transfer_succeeds(account_owner, account_receiver, 0)
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transfer_to_others_possible(self):
         """A successful `transfer` call of zero amount to another account MUST be possible."""
         self.setup_contract()
@@ -308,7 +308,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_transfer_succeeds(account_owner, account_receiver, 0)
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transfer_to_self_emits_event(self):
         """A successful `transfer` call of zero amount to self MUST emit the Transfer event correctly."""
         self.setup_contract()
@@ -318,7 +318,7 @@ class ERC20Minimal(ERC20Base):
         self.assert_transfer_succeeds(account_owner, account_owner, 0)
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_zero_transfer_to_self_possible(self):
         """A successful `transfer` call of zero amount to self MUST be possible."""
         self.setup_contract()
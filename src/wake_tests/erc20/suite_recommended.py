@@ -2,7 +2,7 @@ import pytest
 
 from wake.testing import *
 
-from .suite_abc import ERC20Base
+from .suite_abc import ERC20Base, connect_chain
 
 
 class ERC20Recommended(ERC20Base):
@@ -13,7 +13,7 @@ class ERC20Recommended(ERC20Base):
     hence the tests cannot both pass.
     """
 
-    @default_chain.connect()
+    @connect_chain
     def test_cannot_transferFrom_more_than_allowance_lower_than_balance(self):
         """A tokenReceiver SHOULD NOT be able to call `transferFrom` of an amount more than her allowance from the tokenSender even if the tokenSender's balance is more than or equal to the said amount."""
         self.setup_contract()
@@ -33,7 +33,7 @@ class ERC20Recommended(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_cannot_transferFrom_more_than_balance_but_lower_than_allowance(self):
         """A tokenReceiver SHOULD NOT be able to call `transferFrom` of an amount more than the tokenSender's balance even if the tokenReceiver's allowance from the tokenSender is more than the said amount."""
         self.setup_contract()
@@ -53,7 +53,7 @@ class ERC20Recommended(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_cannot_transfer_more_than_balance(self):
         """A tokenSender (which is also the `msg.sender`) SHOULD NOT be able to call `transfer` of an amount more than his balance."""
         self.setup_contract()
@@ -66,7 +66,7 @@ class ERC20Recommended(ERC20Base):
         self.assert_transfer_reverts(account_owner, account_receiver, send_amount)
         self.assert_balances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     def test_no_approval_cannot_transferFrom(self):
         """A tokenReceiver SHOULD NOT be able to call `transferFrom` of any positive amount from an tokenSender if the tokenSender did not approve the tokenReceiver previously."""
         self.setup_contract()
@@ -84,7 +84,7 @@ class ERC20Recommended(ERC20Base):
         self.assert_balances_match_expected()
         self.assert_allowances_match_expected()
 
-    @default_chain.connect()
+    @connect_chain
     @pytest.mark.xfail(
         reason="transferFrom() from self by self SHOULD revert without self-approval but it is not a part of the standard."
     )
@@ -1,6 +1,8 @@
-from dataclasses import fields
+import inspect
+from collections import Counter
+from dataclasses import fields, is_dataclass
 from functools import lru_cache, wraps
-from typing import Dict
+from typing import Dict, List, Tuple
 from wake.testing import Account, Address, uint, keccak256
 
 
@@ -29,6 +31,10 @@ class ReturnInsteadOfRevertWarning(Warning):
     ...
 
 
+class DivergentBehaviorWarning(Warning):
+    ...
+
+
 # Helpers
 
 
@@ -46,31 +52,65 @@ def shorten_address(address: Address) -> str:
     return f"{address[:5]}..{address[-3:]}"
 
 
-def all_events_emitted(tx_events, expected_events) -> bool:
-    # Different implementations have different argument namings of events
-    # The things that should be the same are:
-    # 1. Event name
-    # 2. Arguments values
-    # 3. Arguments order
-    def _cvt_event(_event):
-        # Events are dataclasses
-        values = []
-        for f in fields(_event):
-            if f.name == "origin":
-                # a new field in version 4.0.0
-                continue
-            value = getattr(_event, f.name)
-            # cannot directly compare Address and Account instances
-            value = value.address if isinstance(value, Account) else value
-            values.append(value)
-        return _event.__class__.__name__, *values
-
-    tx_events = [_cvt_event(e) for e in tx_events]
-    expected_events = [_cvt_event(e) for e in expected_events]
+@lru_cache(maxsize=None)
+def _event_fields(event_class: type) -> Tuple[str, ...]:
+    # the dataclass reflection is done once per event class
+    return tuple(f.name for f in fields(event_class) if f.name != "origin")
+
+
+def event_key(event) -> Tuple:
+    """Hashable representation of an event: its name and argument values.
+
+    Different implementations have different argument namings of events.
+    The things that should be the same are:
+    1. Event name
+    2. Arguments values
+    3. Arguments order"""
+    values = []
+    for name in _event_fields(type(event)):
+        value = getattr(event, name)
+        # cannot directly compare Address and Account instances
+        if isinstance(value, Account):
+            value = value.address
+        elif isinstance(value, list):
+            # e.g. topics of unknown events
+            value = tuple(value)
+        values.append(value)
+    return type(event).__name__, *values
+
+
+def missing_events(tx_events, expected_events) -> List:
+    """Return the expected events (a single event or a list) that were not emitted,
+    an event expected n times must be emitted at least n times."""
+    if is_dataclass(expected_events):
+        expected_events = [expected_events]
+    emitted = Counter(event_key(e) for e in tx_events)
+    missing = []
     for event in expected_events:
-        if event not in tx_events:
-            return False
-    return True
+        key = event_key(event)
+        if emitted[key] > 0:
+            emitted[key] -= 1
+        else:
+            missing.append(event)
+    return missing
+
+
+def all_events_emitted(tx_events, expected_events) -> bool:
+    return len(missing_events(tx_events, expected_events)) == 0
+
+
+def assert_events_emitted(tx_events, expected_events, message: str) -> None:
+    missing = missing_events(tx_events, expected_events)
+    assert len(missing) == 0, f"{message}: {missing} not emitted"
+
+
+def assert_events_not_emitted(tx_events, unexpected_events, message: str) -> None:
+    """Assert that none of the events (a single event or a list) was emitted."""
+    if is_dataclass(unexpected_events):
+        unexpected_events = [unexpected_events]
+    emitted = set(event_key(e) for e in tx_events)
+    found = [e for e in unexpected_events if event_key(e) in emitted]
+    assert len(found) == 0, f"{message}: {found} emitted"
 
 
 # Wrappers
@@ -78,9 +118,12 @@ def all_events_emitted(tx_events, expected_events) -> bool:
 
 # source: https://stackoverflow.com/questions/25828864/catch-before-after-function-call-events-for-all-functions-in-class
 def decorate_all_functions(function_decorator):
+    """Decorate the public methods of a class. Private methods are called with
+    already processed arguments and stay undecorated."""
+
     def decorator(cls):
         for name, obj in vars(cls).items():
-            if callable(obj):
+            if callable(obj) and not name.startswith("_"):
                 try:
                     obj = obj.__func__  # unwrap Python 2 unbound method
                 except AttributeError:
@@ -92,21 +135,30 @@ def decorate_all_functions(function_decorator):
 
 
 def account_to_address_converter(func):
+    """Convert `Account` arguments to `Address`. The parameters to convert are
+    selected by their annotation mentioning `Account` once, at decoration time;
+    functions without such parameters are returned as they are."""
+    positions = []
+    names = []
+    for i, (name, param) in enumerate(inspect.signature(func).parameters.items()):
+        if "Account" not in str(param.annotation):
+            continue
+        if param.kind != param.KEYWORD_ONLY:
+            positions.append(i)
+        if param.kind != param.POSITIONAL_ONLY:
+            names.append(name)
+    if not positions and not names:
+        return func
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        cvt_args = []
-        for arg in args:
-            # not using isinstance to not overwrite contracts instances
-            if type(arg) is Account:
-                arg = arg.address
-            cvt_args.append(arg)
-        cvt_kwargs = {}
-        for name, value in kwargs.items():
-            # not using isinstance to not overwrite contracts instances
-            if type(value) is Account:
-                value = value.address
-            cvt_kwargs[name] = value
-        res = func(*cvt_args, **cvt_kwargs)
-        return res
+        # not using isinstance to not overwrite contracts instances
+        for i in positions:
+            if i < len(args) and type(args[i]) is Account:
+                args = args[:i] + (args[i].address,) + args[i + 1 :]
+        for name in names:
+            if type(kwargs.get(name)) is Account:
+                kwargs[name] = kwargs[name].address
+        return func(*args, **kwargs)
 
     return wrapper